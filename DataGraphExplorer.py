@@ -4,18 +4,390 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 import requests
-from io import StringIO
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO
+from itertools import combinations
+from urllib.parse import urlparse
+from DatasetCache import DatasetCache
+from Instrumentation import count, timed
+
+# Rows per DataFrame when a dataset is read in chunks.
+CHUNK_ROWS = 100000
+
+# Local files with these extensions are read through pyarrow, which only
+# touches the requested columns on disk. Feather v2 is the Arrow IPC format.
+COLUMNAR_FORMATS = {'.parquet': 'parquet', '.pq': 'parquet', '.feather': 'arrow', '.arrow': 'arrow', '.ipc': 'arrow'}
+
+def _is_url(source):
+    """True for http(s) URLs; anything else, such as a file named http_data.csv, is a local path."""
+    return urlparse(source).scheme in ('http', 'https')
+
+def _columnar_format(source):
+    return COLUMNAR_FORMATS.get(os.path.splitext(source)[1].lower())
+
+def _read_columnar(path, file_format, usecols=None, dtype=None):
+    """Reads only the usecols columns of a local Parquet or Arrow/Feather file, memory-mapped."""
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        table = pq.read_table(path, columns=usecols, memory_map=True)
+    else:
+        import pyarrow.feather as feather
+        table = feather.read_table(path, columns=usecols, memory_map=True)
+    df = table.to_pandas()
+    return df.astype(dtype) if dtype is not None else df
+
+def _iter_columnar(path, file_format, usecols=None, dtype=None, chunksize=CHUNK_ROWS):
+    """Yields a local Parquet or Arrow/Feather file as DataFrames of at most chunksize rows."""
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        batches = pq.ParquetFile(path, memory_map=True).iter_batches(batch_size=chunksize, columns=usecols)
+    else:
+        import pyarrow.feather as feather
+        batches = feather.read_table(path, columns=usecols, memory_map=True).to_batches(max_chunksize=chunksize)
+    for batch in batches:
+        df = batch.to_pandas()
+        yield df.astype(dtype) if dtype is not None else df
+
+# Above these sizes plots are reduced before rendering, so render time stays
+# bounded however many rows the dataset has.
+MAX_LINE_POINTS = 4000
+MAX_SCATTER_POINTS = 200000
+HISTOGRAM_BINS = 10
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets downsampling of a line.
+
+    Returns the indices of n_out points (always including the first and
+    last) chosen so the reduced line keeps the visual shape of the original.
+    The work per bucket is vectorized, so the Python loop runs n_out times
+    regardless of len(x).
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # n_out - 2 buckets over the interior points; the endpoints are always kept.
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[stop:next_stop].mean()
+        avg_y = y[stop:next_stop].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+def minmax_decimate(y, n_bins):
+    """Keeps the minimum and maximum of each of n_bins consecutive row buckets.
+
+    Returns sorted indices (at most 2 * n_bins), so spikes survive the
+    reduction. Fully vectorized; cheaper than lttb but keeps more points.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if 2 * n_bins >= n:
+        return np.arange(n)
+    size = -(-n // n_bins)
+    full = n // size
+    blocks = y[:full * size].reshape(full, size)
+    offsets = np.arange(full) * size
+    indices = [offsets + blocks.argmin(axis=1), offsets + blocks.argmax(axis=1)]
+    if full * size < n:
+        tail = y[full * size:]
+        indices.append(np.array([full * size + tail.argmin(), full * size + tail.argmax()]))
+    return np.unique(np.concatenate(indices))
+
+class StreamingHistogram:
+    """Accumulates histogram counts over fixed bin edges one chunk at a time."""
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        self.counts += np.histogram(values[~np.isnan(values)], bins=self.edges)[0]
+        return self
+
+class ColumnProfile:
+    """Running statistics of one column, updated one chunk at a time.
+
+    Count, nulls, min/max and mean/std (merged with Chan's parallel
+    formula) are exact. Quantiles come from a fixed-size reservoir sample,
+    which is exact until more than SAMPLE_SIZE values have been seen.
+    """
+
+    SAMPLE_SIZE = 10000
+
+    def __init__(self, name, dtype):
+        self.name = name
+        self.dtype = dtype
+        self.count = 0  # non-null values
+        self.nulls = 0
+        self.minimum = None
+        self.maximum = None
+        self.mean = np.nan
+        self._m2 = 0.0
+        self._sample = np.empty(0)
+        self._rng = np.random.default_rng(0)
+
+    @property
+    def numeric(self):
+        return _is_numeric_dtype(self.dtype)
+
+    @property
+    def std(self):
+        return float(np.sqrt(self._m2 / (self.count - 1))) if self.count > 1 else np.nan
+
+    def update(self, series):
+        """Folds one chunk of the column into the statistics."""
+        nulls = int(series.isna().sum())
+        self.nulls += nulls
+        if not self.numeric:
+            self.count += len(series) - nulls
+            return self
+        values = series.dropna().to_numpy(dtype=float)
+        if len(values) == 0:
+            return self
+
+        n = len(values)
+        chunk_mean = values.mean()
+        chunk_m2 = float(((values - chunk_mean)**2).sum())
+        if self.count == 0:
+            self.mean, self._m2 = chunk_mean, chunk_m2
+            self.minimum, self.maximum = values.min(), values.max()
+        else:
+            total = self.count + n
+            delta = chunk_mean - self.mean
+            self.mean += delta * n / total
+            self._m2 += chunk_m2 + delta**2 * self.count * n / total
+            self.minimum, self.maximum = min(self.minimum, values.min()), max(self.maximum, values.max())
+        self._add_to_sample(values)
+        self.count += n
+        return self
+
+    def _add_to_sample(self, values):
+        # Reservoir sampling (Algorithm R), vectorized over the chunk: the
+        # i-th value seen overall replaces a random slot with probability
+        # SAMPLE_SIZE / (i + 1). Later writes to the same slot win, as they
+        # would sequentially.
+        room = self.SAMPLE_SIZE - len(self._sample)
+        if room > 0:
+            self._sample = np.concatenate([self._sample, values[:room]])
+            values = values[room:]
+        if len(values):
+            seen = self.count + (room if room > 0 else 0) + np.arange(len(values))
+            slots = self._rng.integers(0, seen + 1)
+            accepted = slots < self.SAMPLE_SIZE
+            self._sample[slots[accepted]] = values[accepted]
+
+    def quantile(self, q):
+        """Approximate quantile(s) q in [0, 1] of the non-null values."""
+        return np.quantile(self._sample, q) if len(self._sample) else np.nan
+
+    def bin_edges(self, bins=HISTOGRAM_BINS):
+        """Histogram edges over the full range, identical to np.histogram's for the whole column."""
+        return np.histogram_bin_edges([self.minimum, self.maximum], bins=bins)
+
+    def limits(self, margin=0.05):
+        """Axis limits covering every value with matplotlib's default margin, or None."""
+        if self.minimum is None or self.minimum == self.maximum:
+            return None
+        pad = (self.maximum - self.minimum) * margin
+        return self.minimum - pad, self.maximum + pad
+
+    def summary(self):
+        row = {'dtype': str(self.dtype), 'count': self.count, 'nulls': self.nulls}
+        if self.numeric and self.count:
+            row.update(min=self.minimum, max=self.maximum, mean=self.mean, std=self.std)
+            row.update(zip(['25%', '50%', '75%'], self.quantile([0.25, 0.5, 0.75])))
+        return row
+
+def update_profiles(profiles, df):
+    """Folds a DataFrame (or one more chunk of it) into a {column: ColumnProfile} dict."""
+    for column in df.columns:
+        if column not in profiles:
+            profiles[column] = ColumnProfile(column, df[column].dtype)
+        profiles[column].update(df[column])
+    return profiles
+
+def _is_numeric(values):
+    return np.issubdtype(np.asarray(values).dtype, np.number)
+
+def _is_numeric_dtype(dtype):
+    """True for numeric pandas/NumPy dtypes other than bool, the columns that get binned histograms."""
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+def reduce_for_plot(x_data, y_data, plot_type, line_reduction='lttb', max_line_points=MAX_LINE_POINTS):
+    """Returns the x and y arrays to draw, downsampling long numeric line graphs.
+
+    Scatter plots keep every point; past max_scatter_points draw_plot shows
+    them as a density instead.
+    """
+    if plot_type != 'line' or len(x_data) <= max_line_points:
+        return x_data, y_data
+    if not (_is_numeric(x_data) and _is_numeric(y_data)):
+        return x_data, y_data
+    valid = ~(np.isnan(x_data.astype(float)) | np.isnan(y_data.astype(float)))
+    x_data, y_data = x_data[valid], y_data[valid]
+    if line_reduction == 'minmax':
+        kept = minmax_decimate(y_data, max_line_points // 2)
+    else:
+        kept = lttb(x_data, y_data, max_line_points)
+    return x_data[kept], y_data[kept]
+
+def plot_filename(plot_type, col1, col2=None):
+    if plot_type == 'histogram':
+        return f'histogram_{col1}.png'
+    return f'{plot_type}_{col1}_vs_{col2}.png'
+
+def _label_histogram(ax, column):
+    ax.set_title(f'Distribution of {column}')
+    ax.set_xlabel(column)
+    ax.set_ylabel('Frequency')
+    ax.grid(True)
+
+def _draw_histogram(ax, counts, edges, column):
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', edgecolor='black')
+    _label_histogram(ax, column)
+
+def _draw_category_counts(ax, counts, column):
+    """Draws one bar per value of a non-numeric column from a value_counts Series."""
+    ax.bar(counts.index.astype(str), counts.to_numpy(), edgecolor='black')
+    _label_histogram(ax, column)
+
+def draw_plot(fig, df, plot_type, col1, col2=None, line_reduction='lttb',
+              max_line_points=MAX_LINE_POINTS, max_scatter_points=MAX_SCATTER_POINTS, profiles=None):
+    """Clears fig and draws one 'histogram', 'scatter' or 'line' plot of df on it.
+
+    Drawing into a caller-owned figure lets batch workers reuse one figure
+    for every plot instead of creating a new one each time. When profiles
+    ({column: ColumnProfile}) are given, histogram edges and axis limits
+    come from them instead of rescanning the columns.
+    """
+    profiles = profiles or {}
+    fig.clf()
+    ax = fig.add_subplot()
+    if plot_type == 'histogram':
+        with timed('datagraph.extract_columns'):
+            data = df[col1].dropna()
+        if not _is_numeric_dtype(data.dtype):
+            _draw_category_counts(ax, data.value_counts(sort=False), col1)
+            return
+        profile = profiles.get(col1)
+        edges = profile.bin_edges() if profile is not None and profile.count and profile.numeric else HISTOGRAM_BINS
+        counts, edges = np.histogram(data.to_numpy(dtype=float), bins=edges)
+        _draw_histogram(ax, counts, edges, col1)
+        return
+
+    with timed('datagraph.extract_columns'):
+        x_data, y_data = df[col1].to_numpy(), df[col2].to_numpy()
+    with timed('datagraph.reduce'):
+        x_data, y_data = reduce_for_plot(x_data, y_data, plot_type, line_reduction, max_line_points)
+    if plot_type == 'scatter' and len(x_data) > max_scatter_points:
+        density = ax.hexbin(x_data, y_data, gridsize=200, bins='log', mincnt=1)
+        fig.colorbar(density, ax=ax, label='Count')
+        ax.set_title(f'Scatter Plot of {col1} vs {col2}')
+    elif plot_type == 'scatter':
+        ax.scatter(x_data, y_data)
+        ax.set_title(f'Scatter Plot of {col1} vs {col2}')
+    elif plot_type == 'line':
+        ax.plot(x_data, y_data)
+        ax.set_title(f'Line Graph of {col1} vs {col2}')
+    else:
+        raise ValueError(f"Unknown plot type '{plot_type}'.")
+    ax.set_xlabel(col1)
+    ax.set_ylabel(col2)
+    # Reduced data may miss the extremes; the profiled range never does.
+    for column, set_limits in ((col1, ax.set_xlim), (col2, ax.set_ylim)):
+        profile = profiles.get(column)
+        limits = profile.limits() if profile is not None and profile.numeric else None
+        if limits is not None:
+            set_limits(*limits)
+
+def histogram_specs(columns):
+    """Plot specs for a histogram of every column."""
+    return [('histogram', column, None) for column in columns]
+
+def scatter_specs(columns):
+    """Plot specs for a scatter plot of every pair of columns."""
+    return [('scatter', col1, col2) for col1, col2 in combinations(columns, 2)]
+
+# State of a render_batch worker process: the data, where to write, and one
+# figure that is cleared and reused for every plot the worker draws.
+_render_state = {}
+
+def _init_render_worker(df, output_dir, settings):
+    _render_state.update(df=df, output_dir=output_dir, settings=settings, figure=plt.figure(figsize=(8, 6)))
+
+def _render_spec(spec):
+    plot_type, col1, col2 = spec
+    fig = _render_state['figure']
+    draw_plot(fig, _render_state['df'], plot_type, col1, col2, **_render_state['settings'])
+    path = os.path.join(_render_state['output_dir'], plot_filename(plot_type, col1, col2))
+    with timed('datagraph.savefig'):
+        fig.savefig(path)
+    fig.clf()
+    return path
+
+def render_batch(df, specs, output_dir='.', workers=None, **settings):
+    """Renders (plot_type, col1, col2) specs of df to PNG files in output_dir.
+
+    The specs are spread over a pool of `workers` processes (all cores by
+    default). Each worker receives only the columns the specs use and
+    draws every plot into one reused figure, so memory stays flat however
+    many plots it renders. settings are passed on to draw_plot. Returns the
+    written paths in spec order.
+    """
+    specs = list(specs)
+    columns = list(dict.fromkeys(column for _, col1, col2 in specs for column in (col1, col2) if column))
+    df = df[columns]
+    os.makedirs(output_dir, exist_ok=True)
+    workers = min(workers or os.cpu_count() or 1, len(specs))
+
+    if workers <= 1:
+        _init_render_worker(df, output_dir, settings)
+        try:
+            return [_render_spec(spec) for spec in specs]
+        finally:
+            plt.close(_render_state.pop('figure'))
+            _render_state.clear()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker,
+                             initargs=(df, output_dir, settings)) as pool:
+        return list(pool.map(_render_spec, specs, chunksize=max(1, len(specs) // (workers * 4))))
 
 class DataGraphExplorer:
-    def __init__(self):
+    def __init__(self, cache=None):
         self.df = None
+        self.source = None  # where self.df was loaded from
         self.column_names = []
+        self.cache = cache  # optional DatasetCache for remote datasets
+        self.line_reduction = 'lttb'  # or 'minmax'
+        self.max_line_points = MAX_LINE_POINTS
+        self.max_scatter_points = MAX_SCATTER_POINTS
+        self.profiles = {}  # {column: ColumnProfile} of the loaded data
+        self.profiles_source = None  # the source self.profiles describe
 
     def load_csv(self):
-        load_type = int(input("Choose load method:\n1. Upload from local (not supported in headless)\n2. Enter URL\n3. Use URL in code\nEnter choice (2 or 3): "))
-        if load_type in [2, 3]:
+        load_type = int(input("Choose load method:\n1. Local file (CSV, Parquet, Feather/Arrow)\n2. Enter URL\n3. Use URL in code\nEnter choice (1, 2 or 3): "))
+        if load_type in [1, 2, 3]:
             try:
-                if load_type == 2:
+                if load_type == 1:
+                    path = input("Enter file path:")
+                    if path:
+                        self._read_csv(path)
+                elif load_type == 2:
                     url = input("Enter CSV URL:")
                     if url:
                         self._read_csv(url)
@@ -29,28 +401,86 @@ class DataGraphExplorer:
                     print(self.df.columns.tolist())
                     print("\nFirst two rows:")
                     print(self.df.head(2))
+                    print("\nColumn summary:")
+                    print(self.profile_summary())
                     self.column_names = self.df.columns.tolist()
                     self.generate_graph()
             except Exception as e:
                 print(f"Error loading data: {e}")
 
-    def _read_csv(self, source):
-        try:
-            if source.startswith('http'):
-                response = requests.get(source)
-                response.raise_for_status()
-                csv_data = StringIO(response.text)
-                self.df = pd.read_csv(csv_data)
+    def _read_csv(self, source, usecols=None, dtype=None):
+        """Loads a URL or local file into self.df.
+
+        URLs are parsed as the HTTP body streams in, or served from
+        self.cache when one is set. Local CSVs are
+        memory-mapped, and local Parquet/Feather/Arrow files only read the
+        usecols columns from disk. usecols and dtype keep only the plotted
+        columns, in the requested types.
+        """
+        with self._csv_errors():
+            if _is_url(source) and self.cache is not None:
+                self.df = self.cache.read_frame(source, usecols, dtype)
+            elif _is_url(source):
+                with self._open_stream(source) as stream:
+                    # The body is downloaded while it is parsed, so this
+                    # includes the transfer after datagraph.connect.
+                    with timed('datagraph.parse'):
+                        self.df = pd.read_csv(stream, usecols=usecols, dtype=dtype)
+            elif _columnar_format(source):
+                with timed('datagraph.parse'):
+                    self.df = _read_columnar(source, _columnar_format(source), usecols, dtype)
+            else:
+                with timed('datagraph.parse'):
+                    self.df = pd.read_csv(source, usecols=usecols, dtype=dtype, memory_map=True)
+        count('datagraph.rows_loaded', len(self.df))
+        self.source = source
+        with timed('datagraph.profile'):
+            self.profiles = update_profiles({}, self.df)
+        self.profiles_source = source
+
+    def iter_csv_chunks(self, source, usecols=None, dtype=None, chunksize=CHUNK_ROWS):
+        """Yields a URL or local file as DataFrames of at most chunksize rows.
+
+        Only one chunk is held in memory at a time, so datasets larger than
+        RAM can be aggregated chunk by chunk. self.df is left unchanged.
+        """
+        with self._csv_errors():
+            if _is_url(source) and self.cache is not None:
+                source = self.cache.fetch(source)
+            if _is_url(source):
+                with self._open_stream(source) as stream:
+                    with pd.read_csv(stream, usecols=usecols, dtype=dtype, chunksize=chunksize) as reader:
+                        yield from reader
+            elif _columnar_format(source):
+                yield from _iter_columnar(source, _columnar_format(source), usecols, dtype, chunksize)
             else:
-                raise ValueError("Local file upload not supported in headless mode.")
+                with pd.read_csv(source, usecols=usecols, dtype=dtype, chunksize=chunksize, memory_map=True) as reader:
+                    yield from reader
+
+    @contextmanager
+    def _open_stream(self, source):
+        """Opens a URL as a file-like object that reads the HTTP body on demand."""
+        with timed('datagraph.connect'):
+            response = requests.get(source, stream=True)
+        with response:
+            response.raise_for_status()
+            response.raw.decode_content = True  # undo gzip/deflate transfer encoding
+            yield response.raw
+
+    @contextmanager
+    def _csv_errors(self):
+        try:
+            yield
         except requests.exceptions.RequestException as e:
             raise Exception(f"Error fetching URL: {e}")
-        except ValueError as e:
-            raise e
         except pd.errors.EmptyDataError:
             raise Exception("The CSV file is empty.")
         except pd.errors.ParserError:
             raise Exception("Error parsing the CSV file.")
+        except OSError as e:
+            raise Exception(f"Error reading file: {e}")
+        except ValueError as e:
+            raise e
 
     def generate_graph(self):
         if self.df is None or not self.column_names:
@@ -76,49 +506,202 @@ class DataGraphExplorer:
             print(f"Column '{col1}' not found.")
 
     def _plot_single_variable(self, column):
+        self._save_plot('histogram', column, not_found=f"Column '{column}' not found.")
+
+    def _plot_two_variables(self, col1, col2, plot_type='scatter'):
+        self._save_plot(plot_type, col1, col2, not_found="One or both columns not found.")
+
+    def _plot_settings(self):
+        return {
+            'line_reduction': self.line_reduction,
+            'max_line_points': self.max_line_points,
+            'max_scatter_points': self.max_scatter_points,
+            'profiles': self._profiles_for(self.source),
+        }
+
+    def _profiles_for(self, source):
+        """self.profiles if they were recorded for source, else an empty dict."""
+        return self.profiles if source is not None and source == self.profiles_source else {}
+
+    def profile_source(self, source, usecols=None, chunksize=CHUNK_ROWS):
+        """Profiles a dataset too large to load in one pass over its chunks and caches the result in self.profiles."""
+        profiles = {}
+        for chunk in self.iter_csv_chunks(source, usecols=usecols, chunksize=chunksize):
+            update_profiles(profiles, chunk)
+        self.profiles = profiles
+        self.profiles_source = source
+        return profiles
+
+    def profile_summary(self):
+        """Returns the cached column profiles as a DataFrame with one row per column."""
+        return pd.DataFrame({column: profile.summary() for column, profile in self.profiles.items()}).T
+
+    def _save_plot(self, plot_type, col1, col2=None, not_found="Column not found."):
+        fig = plt.figure(figsize=(8, 6))
         try:
-            data = self.df[column].to_numpy()
-            plt.figure(figsize=(8, 6))
-            plt.hist(data, bins=10, edgecolor='black')
-            plt.title(f'Distribution of {column}')
-            plt.xlabel(column)
-            plt.ylabel('Frequency')
-            plt.grid(True)
-            plt.savefig(f'histogram_{column}.png') # Save the plot
-            print(f"Histogram saved as histogram_{column}.png")
+            draw_plot(fig, self.df, plot_type, col1, col2, **self._plot_settings())
+            filename = plot_filename(plot_type, col1, col2)
+            with timed('datagraph.savefig'):
+                fig.savefig(filename) # Save the plot
+            labels = {'histogram': 'Histogram', 'scatter': 'Scatter plot', 'line': 'Line graph'}
+            print(f"{labels[plot_type]} saved as {filename}")
         except KeyError:
-            print(f"Column '{column}' not found.")
+            print(not_found)
         except Exception as e:
             print(f"An error occurred during plotting: {e}")
+        finally:
+            plt.close(fig)
 
-    def _plot_two_variables(self, col1, col2, plot_type='scatter'):
+    def render_batch(self, specs, output_dir='.', workers=None):
+        """Renders many plots of the loaded data in parallel; see the module-level render_batch."""
+        return render_batch(self.df, specs, output_dir, workers, **self._plot_settings())
+
+    def render_all_histograms(self, output_dir='.', workers=None):
+        """Renders a histogram of every numeric column."""
+        return self.render_batch(histogram_specs(self.df.select_dtypes('number').columns), output_dir, workers)
+
+    def render_all_scatter_plots(self, output_dir='.', workers=None):
+        """Renders a scatter plot of every pair of numeric columns."""
+        return self.render_batch(scatter_specs(self.df.select_dtypes('number').columns), output_dir, workers)
+
+    def plot_histogram_from_source(self, source, column, bins=HISTOGRAM_BINS, chunksize=CHUNK_ROWS):
+        """Saves the histogram of one column of a dataset too large to load, reading it in chunks.
+
+        The column's range comes from self.profiles when they were recorded
+        for this same source; otherwise a first pass profiles the column. The
+        counts are then accumulated in one more pass, so memory stays
+        bounded by one chunk. A non-numeric column gets one bar per value.
+        """
         try:
-            x_data = self.df[col1].to_numpy()
-            y_data = self.df[col2].to_numpy()
-            plt.figure(figsize=(8, 6))
-            if plot_type == 'scatter':
-                plt.scatter(x_data, y_data)
-                plt.title(f'Scatter Plot of {col1} vs {col2}')
-                plt.xlabel(col1)
-                plt.ylabel(col2)
-                plt.savefig(f'scatter_{col1}_vs_{col2}.png') # Save the plot
-                print(f"Scatter plot saved as scatter_{col1}_vs_{col2}.png")
-            elif plot_type == 'line':
-                plt.plot(x_data, y_data)
-                plt.title(f'Line Graph of {col1} vs {col2}')
-                plt.xlabel(col1)
-                plt.ylabel(col2)
-                plt.savefig(f'line_{col1}_vs_{col2}.png') # Save the plot
-                print(f"Line graph saved as line_{col1}_vs_{col2}.png")
-            plt.grid(True)
-        except KeyError:
-            print("One or both columns not found.")
+            profile = self._profiles_for(source).get(column)
+            if profile is None:
+                profile = ColumnProfile(column, np.dtype(float))
+                try:
+                    for chunk in self.iter_csv_chunks(source, usecols=[column], chunksize=chunksize):
+                        profile.update(chunk[column].astype(float))
+                except (TypeError, ValueError):
+                    profile = ColumnProfile(column, np.dtype(object))
+
+            fig = plt.figure(figsize=(8, 6))
+            try:
+                if profile.numeric:
+                    drawn = self._stream_histogram(fig.add_subplot(), source, column, profile, bins, chunksize)
+                else:
+                    drawn = self._stream_category_counts(fig.add_subplot(), source, column, chunksize)
+                if drawn:
+                    with timed('datagraph.savefig'):
+                        fig.savefig(f'histogram_{column}.png') # Save the plot
+            finally:
+                plt.close(fig)
+            if drawn:
+                print(f"Histogram saved as histogram_{column}.png")
+            else:
+                print(f"Column '{column}' has no values to plot.")
         except Exception as e:
             print(f"An error occurred during plotting: {e}")
 
+    def _stream_histogram(self, ax, source, column, profile, bins, chunksize):
+        if not profile.count:
+            return False
+        histogram = StreamingHistogram(profile.bin_edges(bins))
+        for chunk in self.iter_csv_chunks(source, usecols=[column], chunksize=chunksize):
+            histogram.update(chunk[column].to_numpy(dtype=float))
+        _draw_histogram(ax, histogram.counts, histogram.edges, column)
+        return True
+
+    def _stream_category_counts(self, ax, source, column, chunksize):
+        counts = None
+        for chunk in self.iter_csv_chunks(source, usecols=[column], chunksize=chunksize):
+            chunk_counts = chunk[column].value_counts(sort=False)
+            counts = chunk_counts if counts is None else counts.add(chunk_counts, fill_value=0)
+        if counts is None or counts.empty:
+            return False
+        _draw_category_counts(ax, counts.astype(np.int64), column)
+        return True
+
+    def load(self, source, columns=None, dtype=None):
+        """Loads a URL or local file without prompting and returns the DataFrame.
+
+        columns limits loading to the columns that will be plotted.
+        """
+        self._read_csv(source, usecols=columns, dtype=dtype)
+        self.column_names = self.df.columns.tolist()
+        return self.df
+
+    def plot(self, col1, col2=None, plot_type=None, output=None):
+        """Renders one plot of the loaded data without prompting.
+
+        plot_type is 'histogram' (the default for one column), 'scatter'
+        (the default for two) or 'line'. The PNG is written to output when
+        it is given, and returned as bytes otherwise.
+        """
+        if self.df is None:
+            raise ValueError("No data loaded yet.")
+        plot_type = plot_type or ('histogram' if col2 is None else 'scatter')
+        if plot_type != 'histogram' and col2 is None:
+            raise ValueError(f"A {plot_type} plot needs two columns.")
+        for column in (col1, col2):
+            if column is not None and column not in self.df.columns:
+                raise ValueError(f"Column '{column}' not found.")
+
+        fig = plt.figure(figsize=(8, 6))
+        try:
+            draw_plot(fig, self.df, plot_type, col1, col2, **self._plot_settings())
+            with timed('datagraph.savefig'):
+                if output is not None:
+                    fig.savefig(output)
+                    return output
+                buffer = BytesIO()
+                fig.savefig(buffer, format='png')
+                return buffer.getvalue()
+        finally:
+            plt.close(fig)
+
     def run(self):
         self.load_csv()
 
+def main(argv=None):
+    """Command-line entry point; prompts interactively when no source is given."""
+    parser = argparse.ArgumentParser(description="Plot columns of a CSV, Parquet or Feather dataset to PNG.")
+    parser.add_argument('source', nargs='?', help="URL or local path of the dataset (omit for interactive mode)")
+    parser.add_argument('--columns', nargs='+', metavar='COLUMN', help="one column (histogram) or two (x and y)")
+    parser.add_argument('--plot-type', choices=['histogram', 'scatter', 'line'],
+                        help="default: histogram for one column, scatter for two")
+    parser.add_argument('--output', help="PNG path, or '-' to write the PNG to stdout (default: the usual file name)")
+    parser.add_argument('--no-cache', action='store_true', help="always download remote datasets")
+    parser.add_argument('--timing', action='store_true', help="report load and render times on stderr")
+    args = parser.parse_args(argv)
+
+    # The cache lives under the home directory; local files never need it.
+    # Interactive mode may be given a URL, so it gets one unless disabled.
+    use_cache = not args.no_cache and (args.source is None or _is_url(args.source))
+    explorer = DataGraphExplorer(cache=DatasetCache() if use_cache else None)
+    if args.source is None:
+        explorer.run()
+        return 0
+    if not args.columns or len(args.columns) > 2:
+        parser.error("--columns takes one or two column names")
+
+    col1, col2 = (args.columns + [None])[:2]
+    plot_type = args.plot_type or ('histogram' if col2 is None else 'scatter')
+    try:
+        start = time.perf_counter()
+        explorer.load(args.source, columns=list(dict.fromkeys(args.columns)))
+        loaded = time.perf_counter()
+        output = None if args.output == '-' else args.output or plot_filename(plot_type, col1, col2)
+        result = explorer.plot(col1, col2, plot_type, output)
+        rendered = time.perf_counter()
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if output is None:
+        sys.stdout.buffer.write(result)
+    else:
+        print(f"Plot saved as {output}")
+    if args.timing:
+        print(f"load: {(loaded - start) * 1000:.1f} ms, render: {(rendered - loaded) * 1000:.1f} ms", file=sys.stderr)
+    return 0
+
 if __name__ == "__main__":
-    explorer = DataGraphExplorer()
-    explorer.run()
+    sys.exit(main())
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import pandas as pd
+import requests
+
+from Instrumentation import count, timed
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "college-algebra", "datasets")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+class DatasetCache:
+    """On-disk cache of remote CSV datasets, keyed by URL.
+
+    Each entry keeps the raw body, a Parquet copy of the parsed table (when
+    pyarrow is installed) and the response's ETag/Last-Modified headers.
+    Cached entries are revalidated with a conditional GET, so an unchanged
+    dataset costs one 304 response instead of a download. Entries are
+    evicted least recently used first once the cache exceeds max_bytes.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, session=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.session = session or requests.Session()
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url):
+        key = os.path.join(self.directory, hashlib.sha256(url.encode()).hexdigest())
+        return key + ".csv", key + ".parquet", key + ".json"
+
+    def _read_meta(self, meta_path):
+        try:
+            with open(meta_path) as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    def fetch(self, url):
+        """Returns the path of an up-to-date local copy of url's body.
+
+        If the server cannot be reached but a cached copy exists, the cached
+        copy is returned as is.
+        """
+        body_path, parquet_path, meta_path = self._paths(url)
+        meta = self._read_meta(meta_path) if os.path.exists(body_path) else None
+
+        headers = {}
+        if meta and meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta and meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+        try:
+            with timed('datagraph.download'), self.session.get(url, headers=headers, stream=True) as response:
+                if response.status_code == 304 and meta is not None:
+                    count('datagraph.cache_revalidated')
+                    self._touch(body_path, parquet_path, meta_path)
+                    return body_path
+                response.raise_for_status()
+                response.raw.decode_content = True
+                self._store(response, body_path, parquet_path, meta_path, url)
+                count('datagraph.cache_downloaded')
+        except requests.exceptions.ConnectionError:
+            if meta is None:
+                raise
+            return body_path
+
+        self.evict(keep=url)
+        return body_path
+
+    def _store(self, response, body_path, parquet_path, meta_path, url):
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                for block in iter(lambda: response.raw.read(1024 * 1024), b""):
+                    handle.write(block)
+            os.replace(temp_path, body_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        if os.path.exists(parquet_path):
+            os.remove(parquet_path)  # parsed from the old body
+        with open(meta_path, 'w') as handle:
+            json.dump({
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+            }, handle)
+
+    def _store_parquet(self, df, parquet_path):
+        """Writes df's Parquet copy through a temporary file, so an interrupted write leaves no partial copy."""
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        os.close(fd)
+        try:
+            df.to_parquet(temp_path, index=False)
+            os.replace(temp_path, parquet_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def read_frame(self, url, usecols=None, dtype=None):
+        """Returns url as a DataFrame, using the cached Parquet copy when it is current.
+
+        The first read parses the CSV body and stores a Parquet copy; later
+        reads load only the usecols columns from it.
+        """
+        body_path, parquet_path, _ = self._paths(url)
+        self.fetch(url)
+        if os.path.exists(parquet_path):
+            with timed('datagraph.parse'):
+                df = pd.read_parquet(parquet_path, columns=usecols)
+            return df.astype(dtype) if dtype is not None else df
+
+        with timed('datagraph.parse'):
+            df = pd.read_csv(body_path, memory_map=True)
+        try:
+            self._store_parquet(df, parquet_path)
+            self.evict(keep=url)
+        except (ImportError, ValueError, TypeError, NotImplementedError):
+            # No Parquet engine, or columns Arrow cannot convert (its errors
+            # subclass these); the parsed CSV is still good, so keep the raw
+            # body only.
+            pass
+        if usecols is not None:
+            df = df[list(usecols)]
+        return df.astype(dtype) if dtype is not None else df
+
+    def _touch(self, *paths):
+        for path in paths:
+            if os.path.exists(path):
+                os.utime(path)
+
+    def _entries(self):
+        """Returns [(last_used, total_bytes, paths)] for every cached URL."""
+        groups = {}
+        for name in os.listdir(self.directory):
+            key, extension = os.path.splitext(name)
+            if extension in ('.csv', '.parquet', '.json'):
+                groups.setdefault(key, []).append(os.path.join(self.directory, name))
+        entries = []
+        for paths in groups.values():
+            stats = [os.stat(path) for path in paths]
+            entries.append((max(stat.st_mtime for stat in stats), sum(stat.st_size for stat in stats), paths))
+        return entries
+
+    def size(self):
+        """Returns the total bytes held by the cache."""
+        return sum(total for _, total, _ in self._entries())
+
+    def evict(self, keep=None):
+        """Removes least recently used entries until the cache fits in max_bytes.
+
+        The entry for the keep URL is never removed, even if it alone is
+        larger than max_bytes.
+        """
+        kept = self._paths(keep)[0] if keep is not None else None
+        entries = sorted(self._entries(), key=lambda entry: entry[0])
+        total = sum(size for _, size, _ in entries)
+        for _, size, paths in entries:
+            if total <= self.max_bytes:
+                break
+            if kept in paths:
+                continue
+            for path in paths:
+                os.remove(path)
+            total -= size
+
+    def clear(self):
+        """Removes every cached entry."""
+        for _, _, paths in self._entries():
+            for path in paths:
+                os.remove(path)
@@ -1,107 +1,56 @@
- 
+import argparse
+import csv
+import functools
+import inspect
+import itertools
+import json
 import math
-from ipywidgets import interactive
-import matplotlib.pyplot as plt
-import numpy as np
-from IPython.display import display
-
-def calculate_annuity(principal, rate, time, compounding_type, monthly_contribution=0):
-    """Calculates the future value of an annuity."""
-    if rate < 0 or time < 0 or principal < 0 or monthly_contribution < 0:
-        return "Error: Inputs cannot be negative."
-
-    if compounding_type.lower() == 'monthly':
-        r_monthly = rate / (12 * 100)  # Annual rate to monthly decimal
-        n_months = time * 12
-        if r_monthly == 0:
-            future_value = principal + (monthly_contribution * n_months)
-        else:
-            future_value = principal * (1 + r_monthly)**n_months
-            if monthly_contribution > 0:
-                future_value += monthly_contribution * (((1 + r_monthly)**n_months - 1) / r_monthly)
-        return f"Annuity with monthly growth: ${future_value:.2f}"
-    elif compounding_type.lower() == 'continuous':
-        r_annual = rate / 100
-        future_value = principal * math.e**(r_annual * time)
-        return f"Annuity with continuous growth: ${future_value:.2f}"
-    else:
-        return "Error: Invalid compounding type. Choose 'monthly' or 'continuous'."
-
-def calculate_mortgage_payment(principal, rate, time):
-    """Calculates the monthly mortgage payment."""
-    if principal < 0 or rate < 0 or time < 0:
-        return "Error: Inputs cannot be negative."
-
-    r_monthly = rate / (12 * 100)
-    n_months = time * 12
-    if r_monthly == 0:
-        if n_months == 0:
-            return f"Monthly payment: ${principal:.2f} (one-time payment)"
-        else:
-            return f"Monthly payment: ${principal / n_months:.2f} (no interest)"
-    else:
-        numerator = principal * r_monthly * (1 + r_monthly)**n_months
-        denominator = ((1 + r_monthly)**n_months) - 1
-        if denominator == 0:
-            return "Error: Cannot calculate payment (likely zero interest and zero term)."
-        monthly_payment = numerator / denominator
-        return f"Monthly mortgage payment: ${monthly_payment:.2f}"
-
-def estimate_retirement_balance(current_age, retirement_age, current_savings, annual_contribution, annual_growth_rate):
-    """Estimates retirement investment balance."""
-    if current_age < 0 or retirement_age <= current_age or current_savings < 0 or annual_contribution < 0 or annual_growth_rate < 0:
-        return "Error: Invalid input values."
-
-    years_to_retirement = retirement_age - current_age
-    monthly_growth_rate = annual_growth_rate / (12 * 100)
-    months_to_retirement = years_to_retirement * 12
-    monthly_contribution = annual_contribution / 12
-
-    future_value = current_savings
-    for _ in range(months_to_retirement):
-        future_value = (future_value + monthly_contribution) * (1 + monthly_growth_rate)
-
-    return f"Estimated retirement balance: ${future_value:.2f}"
-
-def time_to_double(initial_amount, rate, compounding_type='continuous'):
-    """Determines how long until an amount doubles."""
-    if initial_amount <= 0 or rate <= 0:
-        return "Error: Initial amount and rate must be positive."
-
-    if compounding_type.lower() == 'continuous':
-        time_required = math.log(2) / (rate / 100)
-        return f"Time to double (continuous): {time_required:.2f} years"
-    elif compounding_type.lower() == 'annually':
-        if rate / 100 >= 1:
-            return "Warning: At this rate, doubling occurs in the first year."
-        time_required = math.log(2) / math.log(1 + (rate / 100))
-        return f"Time to double (annually): {time_required:.2f} years"
-    else:
-        return "Error: Invalid compounding type. Choose 'continuous' or 'annually'."
-
-def solve_logarithmic_equation(base, result):
-    """Solves for x in log_base(result) = x."""
-    if base <= 0 or base == 1 or result <= 0:
-        return "Error: Base must be > 0 and not equal to 1, result must be > 0."
-    exponent = math.log(result, base)
-    return f"Solution (exponent): {exponent:.2f}"
-
-def to_scientific_notation(number):
-    """Converts a number to scientific notation."""
-    if number == 0:
-        return "0.0 * 10^0"
-    exponent = math.floor(math.log10(abs(number)))
-    coefficient = round(number * 10**(-exponent), 2)
-    return f"{coefficient} * 10^{exponent}"
-
-def from_scientific_notation(coefficient_str, exponent_str):
-    """Converts from scientific notation to a regular number."""
-    try:
-        coefficient = float(coefficient_str)
-        exponent = int(exponent_str)
-        return coefficient * (10**exponent)
-    except ValueError:
-        return "Error: Invalid coefficient or exponent format."
+import os
+import sys
+from collections import defaultdict
+
+import FinancialDecimal
+from FinancialCore import (
+    BACKENDS,
+    ERR_COMPOUNDING,
+    ERR_INVALID_INPUT,
+    ERR_NONE,
+    ERR_UNDEFINED,
+    amortization_schedule,
+    amortization_table,
+    apply_batch,
+    cache_info,
+    calculate_annuity,
+    calculate_annuity_batch,
+    calculate_mortgage_payment,
+    calculate_mortgage_payment_batch,
+    disable_cache,
+    enable_cache,
+    estimate_retirement_balance,
+    estimate_retirement_balance_batch,
+    export_amortization,
+    from_scientific_notation,
+    iter_amortization_tables,
+    precompute_growth_factors,
+    solve_logarithmic_equation,
+    solve_logarithmic_equation_batch,
+    time_to_double,
+    time_to_double_batch,
+    to_scientific_notation,
+)
+from FinancialSolvers import (
+    solve_annuity_rate,
+    solve_annuity_rate_batch,
+    solve_mortgage_rate,
+    solve_mortgage_rate_batch,
+    solve_mortgage_term,
+    solve_mortgage_term_batch,
+    solve_retirement_contribution,
+    solve_retirement_contribution_batch,
+    solve_retirement_rate,
+    solve_retirement_rate_batch,
+)
+from ParallelMap import ordered_map
 
 def financial_app():
     """Interactive financial application."""
@@ -176,7 +125,218 @@ def financial_app():
         else:
             print("Invalid choice. Please enter a number between 1 and 8.")
 
+# Batch jobs name one of these operations; the batch function (when there is
+# one) evaluates a whole group of jobs at once and the scalar function
+# supplies the parameter names, defaults and error messages.
+BATCH_OPERATIONS = {
+    'annuity': (calculate_annuity_batch, calculate_annuity),
+    'mortgage': (calculate_mortgage_payment_batch, calculate_mortgage_payment),
+    'retirement': (estimate_retirement_balance_batch, estimate_retirement_balance),
+    'double': (time_to_double_batch, time_to_double),
+    'log': (solve_logarithmic_equation_batch, solve_logarithmic_equation),
+    'annuity_rate': (solve_annuity_rate_batch, solve_annuity_rate),
+    'retirement_rate': (solve_retirement_rate_batch, solve_retirement_rate),
+    'retirement_contribution': (solve_retirement_contribution_batch, solve_retirement_contribution),
+    'mortgage_rate': (solve_mortgage_rate_batch, solve_mortgage_rate),
+    'mortgage_term': (solve_mortgage_term_batch, solve_mortgage_term),
+    'to_scientific': (None, to_scientific_notation),
+    'from_scientific': (None, from_scientific_notation),
+}
+
+_TEXT_PARAMETERS = {'compounding_type', 'coefficient_str', 'exponent_str'}
+
+# Operations the decimal backend evaluates row by row; their values are
+# written as strings of cents so no precision is lost to JSON or CSV floats.
+DECIMAL_OPERATIONS = {
+    'annuity': FinancialDecimal.annuity_value,
+    'mortgage': FinancialDecimal.mortgage_payment,
+    'retirement': FinancialDecimal.retirement_balance,
+}
+
+def _job_arguments(job, scalar_function):
+    """Reads the parameters of scalar_function from a job, raising ValueError if one is missing or malformed."""
+    arguments = {}
+    for name, parameter in inspect.signature(scalar_function).parameters.items():
+        if name == 'backend':
+            continue  # chosen for the whole run, not per job
+        value = job.get(name)
+        if value is None or value == '':
+            if parameter.default is inspect.Parameter.empty:
+                raise ValueError(f"Error: Missing parameter '{name}'.")
+            value = parameter.default
+        elif name in _TEXT_PARAMETERS:
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                value = str(value)  # e.g. a JSON exponent written as a number
+            elif not isinstance(value, str):
+                raise ValueError(f"Error: Parameter '{name}' must be text.")
+        else:
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Error: Parameter '{name}' must be a number.")
+            if not math.isfinite(value):
+                raise ValueError(f"Error: Parameter '{name}' must be a finite number.")
+        arguments[name] = value
+    return arguments
+
+def _result_row(job, value=None, error=None):
+    if isinstance(value, float) and math.isnan(value):
+        value = None
+    return {**job, 'value': value, 'error': error}
+
+def run_jobs(jobs, backend='float'):
+    """Evaluates a list of job dicts and returns one result row per job, in order.
+
+    Jobs with the same operation are evaluated together by its batch function.
+    With backend='decimal' the DECIMAL_OPERATIONS values are recomputed with
+    Decimal arithmetic and rounded to cents half to even. A job that is not a
+    dict (such as an unparsable input line) gets an error row holding it
+    under 'job', and so does a CSV row with more fields than the header
+    (csv.DictReader keeps the extras under the key None).
+    """
+    rows = [None] * len(jobs)
+    by_operation = defaultdict(list)
+    for index, job in enumerate(jobs):
+        if not isinstance(job, dict):
+            rows[index] = {'job': job, 'value': None, 'error': "Error: Each job must be a JSON object."}
+            continue
+        if None in job:
+            fields = {key: value for key, value in job.items() if key is not None}
+            rows[index] = _result_row(fields, error="Error: Row has more fields than the header.")
+            continue
+        by_operation[str(job.get('operation', '')).strip().lower()].append(index)
+
+    for operation, indexes in by_operation.items():
+        if operation not in BATCH_OPERATIONS:
+            for index in indexes:
+                rows[index] = _result_row(jobs[index], error=f"Error: Unknown operation '{operation}'.")
+            continue
+        batch_function, scalar_function = BATCH_OPERATIONS[operation]
+
+        valid, arguments = [], []
+        for index in indexes:
+            try:
+                arguments.append(_job_arguments(jobs[index], scalar_function))
+                valid.append(index)
+            except ValueError as e:
+                rows[index] = _result_row(jobs[index], error=str(e))
+
+        if batch_function is None:
+            for index, kwargs in zip(valid, arguments):
+                try:
+                    result = scalar_function(**kwargs)
+                except (ArithmeticError, ValueError) as e:
+                    result = f"Error: Cannot evaluate '{operation}' for these inputs ({e})."
+                if isinstance(result, str) and result.startswith("Error"):
+                    rows[index] = _result_row(jobs[index], error=result)
+                else:
+                    rows[index] = _result_row(jobs[index], result)
+            continue
+
+        if not valid:
+            continue
+        columns = {name: [kwargs[name] for kwargs in arguments] for name in arguments[0]}
+        try:
+            values, errors = batch_function(**columns)
+        except (ArithmeticError, TypeError, ValueError) as e:
+            # Something in the group breaks the vectorized call; evaluate its
+            # jobs one at a time so only the offending rows fail.
+            if len(valid) > 1:
+                for index in valid:
+                    rows[index] = run_jobs([jobs[index]], backend)[0]
+            else:
+                rows[valid[0]] = _result_row(
+                    jobs[valid[0]], error=f"Error: Cannot evaluate '{operation}' for these inputs ({e}).")
+            continue
+        exact_function = DECIMAL_OPERATIONS.get(operation) if backend == 'decimal' else None
+        for position, index in enumerate(valid):
+            if errors[position] == ERR_NONE and exact_function is not None:
+                inputs = [value for value in arguments[position].values() if not isinstance(value, str)]
+                message = FinancialDecimal.input_error(values[position], *inputs)
+                if message:
+                    rows[index] = _result_row(jobs[index], error=message)
+                    continue
+                value = FinancialDecimal.round_cents(exact_function(**arguments[position]))
+                rows[index] = _result_row(jobs[index], str(value))
+            elif errors[position] == ERR_NONE:
+                rows[index] = _result_row(jobs[index], float(values[position]))
+            else:
+                rows[index] = _result_row(jobs[index], error=scalar_function(**arguments[position]))
+    return rows
+
+def _chunks(iterable, chunk_size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def run_batch_jobs(jobs, chunk_size=10000, workers=None, backend='float'):
+    """Yields result rows for an iterable of job dicts, in input order.
+
+    Jobs are consumed chunk_size at a time so memory stays bounded. Input
+    that fits in one chunk is evaluated in-process; larger input is spread
+    over a process pool of `workers` processes (all cores by default) with
+    at most two chunks per worker in flight.
+    """
+    chunks = _chunks(jobs, chunk_size)
+    first = next(chunks, None)
+    second = next(chunks, None)
+    workers = 1 if second is None else workers or os.cpu_count() or 1
+    chunks = (chunk for chunk in itertools.chain([first, second], chunks) if chunk)
+    for rows in ordered_map(functools.partial(run_jobs, backend=backend), chunks, workers):
+        yield from rows
+
+def _read_json_jobs(source):
+    """Yields the job on each non-blank line; a line that is not valid JSON is yielded as its text."""
+    for line in source:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield line.rstrip("\n")
+
+def batch_main(argv=None):
+    """Non-interactive entry point: reads jobs as JSON Lines or CSV and streams results in the same format."""
+    parser = argparse.ArgumentParser(
+        description="Run financial calculations in batch. Each job names an 'operation' "
+                    f"({', '.join(BATCH_OPERATIONS)}) and its parameters.")
+    parser.add_argument('--batch', metavar='PATH', required=True,
+                        help="input file of jobs (.jsonl or .csv), or '-' for stdin")
+    parser.add_argument('--output', metavar='PATH', default='-', help="output file, or '-' for stdout (default)")
+    parser.add_argument('--format', choices=['jsonl', 'csv'],
+                        help="input/output format (default: from the input file extension, jsonl for stdin)")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="jobs evaluated per chunk (default: 10000)")
+    parser.add_argument('--workers', type=int, help="worker processes for large inputs (default: all cores)")
+    parser.add_argument('--backend', choices=BACKENDS, default='float',
+                        help="arithmetic for annuity, mortgage and retirement jobs: fast binary floats (default) "
+                             "or decimal with banker's rounding to cents")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ('csv' if args.batch.lower().endswith('.csv') else 'jsonl')
+    source = sys.stdin if args.batch == '-' else open(args.batch, newline='')
+    target = sys.stdout if args.output == '-' else open(args.output, 'w', newline='')
+    try:
+        if fmt == 'csv':
+            reader = csv.DictReader(source)
+            writer = csv.DictWriter(target, fieldnames=list(reader.fieldnames or []) + ['value', 'error'])
+            writer.writeheader()
+            for row in run_batch_jobs(reader, args.chunk_size, args.workers, args.backend):
+                writer.writerow(row)
+        else:
+            for row in run_batch_jobs(_read_json_jobs(source), args.chunk_size, args.workers, args.backend):
+                target.write(json.dumps(row) + "\n")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    return 0
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(batch_main())
     financial_app()
 
  
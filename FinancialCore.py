@@ -0,0 +1,528 @@
+"""Calculation functions for the financial calculator, with no UI or plotting imports.
+
+pandas and pyarrow are only imported by the functions that build or write tables.
+"""
+import functools
+import inspect
+import math
+
+import numpy as np
+
+import FinancialDecimal
+from Instrumentation import instrument
+
+# Per-row error codes returned by the *_batch functions (0 means the row is valid).
+ERR_NONE = 0
+ERR_INVALID_INPUT = 1
+ERR_COMPOUNDING = 2
+ERR_UNDEFINED = 3
+
+# Arithmetic for the scalar annuity, mortgage and retirement functions: 'float'
+# is the fast NumPy path, 'decimal' uses FinancialDecimal and banker's rounding.
+BACKENDS = ('float', 'decimal')
+
+def _check_backend(backend):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}; choose one of {', '.join(BACKENDS)}.")
+
+def _format_amount(value):
+    """Formats an amount to cents: Decimals are rounded half to even, floats by their binary value."""
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    if isinstance(value, FinancialDecimal.Decimal):
+        return str(FinancialDecimal.round_cents(value))
+    return f"{float(value):.2f}"
+
+def as_float_arrays(*values):
+    """Converts scalars, lists, Series or arrays to float arrays broadcast to one shape.
+
+    This is how every *_batch function reads its inputs; it raises ValueError
+    when the shapes do not broadcast.
+    """
+    return np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in values))
+
+def _as_compounding(compounding_type, shape):
+    """Lower-cases one compounding type or an array of them, broadcast to shape."""
+    return np.broadcast_to(np.char.lower(np.asarray(compounding_type, dtype=str)), shape)
+
+def compute_monthly_factors(r_monthly, n_months):
+    """Returns (growth, annuity_factor, present_value_factor) for monthly rate r over n months.
+
+    growth is (1+r)^n, annuity_factor is ((1+r)^n - 1)/r and
+    present_value_factor is (1 - (1+r)^-n)/r; both factors are n when r is zero.
+    The two factors use expm1/log1p so long terms and tiny rates stay accurate.
+    r_monthly and n_months may be scalars or arrays that broadcast together.
+    The annuity, mortgage and retirement formulas, the Monte Carlo
+    projections and the inverse solvers are all built on these factors.
+    """
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        log_growth = n_months * np.log1p(r_monthly)
+        growth = (1 + r_monthly)**n_months
+        terms = np.broadcast_to(n_months, np.shape(log_growth)).astype(float)
+        annuity_factor = np.divide(np.expm1(log_growth), r_monthly, out=terms.copy(), where=r_monthly != 0)
+        present_value_factor = np.divide(-np.expm1(-log_growth), r_monthly, out=terms, where=r_monthly != 0)
+    return growth, annuity_factor, present_value_factor
+
+def _is_real(*values):
+    """True when every value is a Python int or float; the scalar functions then skip NumPy."""
+    for value in values:
+        if not isinstance(value, (int, float)):
+            return False
+    return True
+
+def _expm1(x):
+    try:
+        return math.expm1(x)
+    except OverflowError:
+        return math.inf
+
+def _math_monthly_factors(r_monthly, n_months):
+    """compute_monthly_factors for one (rate, term) pair with math; overflow gives inf as in NumPy."""
+    try:
+        growth = (1 + r_monthly)**n_months
+    except OverflowError:
+        growth = math.inf
+    if r_monthly == 0:
+        return growth, n_months, n_months
+    log_growth = n_months * math.log1p(r_monthly)
+    return growth, _expm1(log_growth) / r_monthly, -_expm1(-log_growth) / r_monthly
+
+# Opt-in LRU cache of the scalar factors; see enable_cache.
+_cached_monthly_factors = None
+
+def _monthly_factors(r_monthly, n_months):
+    """Factors for one valid (rate, term) pair, looked up in the cache when it is enabled."""
+    if _cached_monthly_factors is None:
+        return _math_monthly_factors(r_monthly, n_months)
+    return _cached_monthly_factors(r_monthly, n_months)
+
+def enable_cache(maxsize=4096):
+    """Caches the growth factors of up to maxsize (rate, term) pairs, evicting the least recently used.
+
+    Every amount in the annuity, mortgage and retirement formulas scales
+    linearly with these factors, so a cached pair serves any principal or
+    contribution. Only the scalar functions use the cache; array inputs are
+    already computed in one vectorized pass.
+    """
+    global _cached_monthly_factors
+    _cached_monthly_factors = functools.lru_cache(maxsize=maxsize)(_math_monthly_factors)
+
+def disable_cache():
+    """Turns the factor cache off and drops its contents."""
+    global _cached_monthly_factors
+    _cached_monthly_factors = None
+
+def cache_info():
+    """Returns the factor cache's (hits, misses, maxsize, currsize), or None when it is disabled."""
+    if _cached_monthly_factors is None:
+        return None
+    return _cached_monthly_factors.cache_info()
+
+def precompute_growth_factors(rates, times):
+    """Builds factor tables for every combination of annual rates (%) and terms (years).
+
+    Returns (growth, annuity_factor, present_value_factor) arrays of shape
+    (len(rates), len(times)), computed in one vectorized pass. When the cache
+    is enabled each valid grid point is also loaded into it, so later scalar
+    queries on the grid are hits.
+    """
+    r_monthly = np.asarray(rates, dtype=float).reshape(-1, 1) / (12 * 100)
+    n_months = np.asarray(times, dtype=float).reshape(1, -1) * 12
+    r_monthly, n_months = np.broadcast_arrays(r_monthly, n_months)
+    tables = compute_monthly_factors(r_monthly, n_months)
+    if _cached_monthly_factors is not None:
+        for r, n in zip(r_monthly.ravel().tolist(), n_months.ravel().tolist()):
+            if r >= 0 and n >= 0:
+                _cached_monthly_factors(r, n)
+    return tables
+
+@instrument('financial.calculate_annuity_batch')
+def calculate_annuity_batch(principal, rate, time, compounding_type, monthly_contribution=0):
+    """Vectorized calculate_annuity. Returns (future_values, error_codes) arrays."""
+    principal, rate, time, monthly_contribution = as_float_arrays(principal, rate, time, monthly_contribution)
+    compounding = _as_compounding(compounding_type, principal.shape)
+    monthly = compounding == 'monthly'
+
+    errors = np.full(principal.shape, ERR_NONE, dtype=np.int8)
+    errors[~monthly & (compounding != 'continuous')] = ERR_COMPOUNDING
+    errors[(rate < 0) | (time < 0) | (principal < 0) | (monthly_contribution < 0)] = ERR_INVALID_INPUT
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        r_monthly = rate / (12 * 100)  # Annual rate to monthly decimal
+        n_months = time * 12
+        growth, annuity_factor, _ = compute_monthly_factors(r_monthly, n_months)
+        contributions = np.where(monthly_contribution > 0, monthly_contribution * annuity_factor, 0.0)
+        monthly_value = principal * growth + contributions
+        continuous_value = principal * np.exp(rate / 100 * time)
+        future_value = np.where(monthly, monthly_value, continuous_value)
+
+    future_value[errors != ERR_NONE] = np.nan
+    return future_value, errors
+
+def _annuity(principal, rate, time, compounding_type, monthly_contribution):
+    """One row of calculate_annuity_batch, computed with math."""
+    compounding = compounding_type.lower()
+    if rate < 0 or time < 0 or principal < 0 or monthly_contribution < 0:
+        return math.nan, ERR_INVALID_INPUT
+    if compounding == 'continuous':
+        try:
+            return principal * math.exp(rate / 100 * time), ERR_NONE
+        except OverflowError:
+            return principal * math.inf, ERR_NONE
+    if compounding != 'monthly':
+        return math.nan, ERR_COMPOUNDING
+    r_monthly = rate / (12 * 100)
+    growth, annuity_factor, _ = _monthly_factors(r_monthly, time * 12)
+    contributions = monthly_contribution * annuity_factor if monthly_contribution > 0 else 0.0
+    return principal * growth + contributions, ERR_NONE
+
+@instrument('financial.calculate_annuity')
+def calculate_annuity(principal, rate, time, compounding_type, monthly_contribution=0, backend='float'):
+    """Calculates the future value of an annuity."""
+    _check_backend(backend)
+    if _is_real(principal, rate, time, monthly_contribution) and isinstance(compounding_type, str):
+        future_value, error = _annuity(principal, rate, time, compounding_type, monthly_contribution)
+    else:
+        future_value, error = calculate_annuity_batch(principal, rate, time, compounding_type, monthly_contribution)
+    if error == ERR_INVALID_INPUT:
+        return "Error: Inputs cannot be negative."
+    if error == ERR_COMPOUNDING:
+        return "Error: Invalid compounding type. Choose 'monthly' or 'continuous'."
+    if backend == 'decimal':
+        message = FinancialDecimal.input_error(future_value, principal, rate, time, monthly_contribution)
+        if message:
+            return message
+        future_value = FinancialDecimal.annuity_value(principal, rate, time, compounding_type, monthly_contribution)
+    return f"Annuity with {compounding_type.lower()} growth: ${_format_amount(future_value)}"
+
+@instrument('financial.calculate_mortgage_payment_batch')
+def calculate_mortgage_payment_batch(principal, rate, time):
+    """Vectorized calculate_mortgage_payment. Returns (monthly_payments, error_codes) arrays."""
+    principal, rate, time = as_float_arrays(principal, rate, time)
+
+    errors = np.full(principal.shape, ERR_NONE, dtype=np.int8)
+
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        r_monthly = rate / (12 * 100)
+        n_months = time * 12
+        # P / ((1 - (1+r)^-n) / r) is the usual P*r*(1+r)^n / ((1+r)^n - 1) divided
+        # through by (1+r)^n, which stays finite for very long terms. A zero
+        # term is a one-time payment without interest and undefined with it.
+        _, _, present_value_factor = compute_monthly_factors(r_monthly, n_months)
+        errors[(r_monthly != 0) & (present_value_factor == 0)] = ERR_UNDEFINED
+        monthly_payment = np.divide(principal, present_value_factor,
+                                    out=np.where(r_monthly == 0, principal, np.nan), where=present_value_factor != 0)
+
+    errors[(principal < 0) | (rate < 0) | (time < 0)] = ERR_INVALID_INPUT
+    monthly_payment[errors != ERR_NONE] = np.nan
+    return monthly_payment, errors
+
+def _mortgage_payment(principal, rate, time):
+    """One row of calculate_mortgage_payment_batch, computed with math."""
+    if principal < 0 or rate < 0 or time < 0:
+        return math.nan, ERR_INVALID_INPUT
+    r_monthly = rate / (12 * 100)
+    _, _, present_value_factor = _monthly_factors(r_monthly, time * 12)
+    if present_value_factor == 0:
+        return (principal, ERR_NONE) if r_monthly == 0 else (math.nan, ERR_UNDEFINED)
+    return principal / present_value_factor, ERR_NONE
+
+@instrument('financial.calculate_mortgage_payment')
+def calculate_mortgage_payment(principal, rate, time, backend='float'):
+    """Calculates the monthly mortgage payment."""
+    _check_backend(backend)
+    if _is_real(principal, rate, time):
+        monthly_payment, error = _mortgage_payment(principal, rate, time)
+    else:
+        monthly_payment, error = calculate_mortgage_payment_batch(principal, rate, time)
+    if error == ERR_INVALID_INPUT:
+        return "Error: Inputs cannot be negative."
+    if error == ERR_UNDEFINED:
+        return "Error: Cannot calculate payment (likely zero interest and zero term)."
+    if backend == 'decimal':
+        message = FinancialDecimal.input_error(monthly_payment, principal, rate, time)
+        if message:
+            return message
+        monthly_payment = FinancialDecimal.mortgage_payment(principal, rate, time)
+    if rate == 0:
+        if time == 0:
+            return f"Monthly payment: ${_format_amount(monthly_payment)} (one-time payment)"
+        return f"Monthly payment: ${_format_amount(monthly_payment)} (no interest)"
+    return f"Monthly mortgage payment: ${_format_amount(monthly_payment)}"
+
+def amortization_schedule(principal, rate, time):
+    """Yields (month, payment, interest, principal_paid, balance) for each month of a loan.
+
+    Rows are produced lazily, so long loans never build a table in memory.
+    The term is rounded to whole months and the payment is computed for that
+    many months; the final payment is adjusted to clear any rounding residue.
+    """
+    _, error = calculate_mortgage_payment_batch(principal, rate, time)
+    if error != ERR_NONE:
+        raise ValueError(calculate_mortgage_payment(principal, rate, time))
+
+    n_months = max(int(round(time * 12)), 1)
+    monthly_payment, _ = calculate_mortgage_payment_batch(principal, rate, n_months / 12)
+    monthly_payment = float(monthly_payment)
+    r_monthly = rate / (12 * 100)
+    balance = float(principal)
+    for month in range(1, n_months + 1):
+        interest = balance * r_monthly
+        principal_paid = balance if month == n_months else monthly_payment - interest
+        balance -= principal_paid
+        yield month, interest + principal_paid, interest, principal_paid, balance
+
+@instrument('financial.amortization_table')
+def amortization_table(principal, rate, time):
+    """Builds the amortization schedule of one or many loans as a DataFrame.
+
+    Every row is evaluated from the closed-form balance after k payments,
+    P*(1+r)^k - payment*((1+r)^k - 1)/r, so there is no Python loop per row.
+    Columns are loan (index into the inputs), month, payment, interest,
+    principal_paid and balance. Terms are rounded to whole months as in
+    amortization_schedule. Loans with invalid inputs are left out.
+    """
+    import pandas as pd
+
+    principal, rate, time = as_float_arrays(principal, rate, time)
+    principal, rate, time = np.ravel(principal), np.ravel(rate), np.ravel(time)
+    _, errors = calculate_mortgage_payment_batch(principal, rate, time)
+    loans = np.flatnonzero((errors == ERR_NONE) & np.isfinite(time))
+
+    n_months = np.maximum(np.rint(time[loans] * 12), 1).astype(np.int64)
+    monthly_payment = np.empty_like(principal)
+    monthly_payment[loans], _ = calculate_mortgage_payment_batch(principal[loans], rate[loans], n_months / 12)
+    ends = np.cumsum(n_months)
+    loan_row = np.repeat(np.arange(len(loans)), n_months)
+    month = np.arange(ends[-1] if len(ends) else 0) - np.repeat(ends - n_months, n_months) + 1
+
+    p = principal[loans][loan_row]
+    r = (rate[loans] / (12 * 100))[loan_row]
+    payment = monthly_payment[loans][loan_row]
+    k = month - 1
+    with np.errstate(over='ignore', invalid='ignore'):
+        paid_factor = np.divide(np.expm1(k * np.log1p(r)), r, out=k.astype(float), where=r != 0)
+        balance_before = p * (1 + r)**k - payment * paid_factor
+    interest = balance_before * r
+    last = month == n_months[loan_row]
+    principal_paid = np.where(last, balance_before, payment - interest)
+    balance = np.where(last, 0.0, balance_before - principal_paid)
+
+    return pd.DataFrame({
+        'loan': loans[loan_row],
+        'month': month,
+        'payment': interest + principal_paid,
+        'interest': interest,
+        'principal_paid': principal_paid,
+        'balance': balance,
+    })
+
+def iter_amortization_tables(principal, rate, time, chunk_loans=10000):
+    """Yields amortization_table frames for consecutive chunks of loans.
+
+    Empty input yields one empty frame, so writers still get the columns.
+    """
+    principal, rate, time = (np.ravel(values) for values in as_float_arrays(principal, rate, time))
+    for start in range(0, max(len(principal), 1), chunk_loans):
+        stop = start + chunk_loans
+        table = amortization_table(principal[start:stop], rate[start:stop], time[start:stop])
+        table['loan'] += start
+        yield table
+
+def export_amortization(principal, rate, time, path, chunk_loans=10000):
+    """Writes amortization schedules for many loans to a .csv or .parquet file.
+
+    Loans are processed in chunks so memory stays bounded by chunk_loans.
+    Parquet output needs pyarrow.
+    """
+    path = str(path)
+    if path.lower().endswith('.csv'):
+        with open(path, 'w', newline='') as handle:
+            for index, table in enumerate(iter_amortization_tables(principal, rate, time, chunk_loans)):
+                table.to_csv(handle, header=index == 0, index=False)
+    elif path.lower().endswith('.parquet'):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for table in iter_amortization_tables(principal, rate, time, chunk_loans):
+                batch = pa.Table.from_pandas(table, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, batch.schema)
+                writer.write_table(batch)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        raise ValueError("Unsupported export format. Use a .csv or .parquet path.")
+
+@instrument('financial.estimate_retirement_balance_batch')
+def estimate_retirement_balance_batch(current_age, retirement_age, current_savings, annual_contribution, annual_growth_rate):
+    """Vectorized estimate_retirement_balance. Returns (balances, error_codes) arrays.
+
+    Each month adds the contribution and then applies growth, so the balance
+    after n months is the geometric series
+    S*(1+r)^n + m*(1+r)*((1+r)^n - 1)/r, or S + m*n when r is zero.
+    """
+    current_age, retirement_age, current_savings, annual_contribution, annual_growth_rate = as_float_arrays(
+        current_age, retirement_age, current_savings, annual_contribution, annual_growth_rate)
+
+    errors = np.full(current_age.shape, ERR_NONE, dtype=np.int8)
+    errors[(current_age < 0) | (retirement_age <= current_age) | (current_savings < 0)
+           | (annual_contribution < 0) | (annual_growth_rate < 0)] = ERR_INVALID_INPUT
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        months_to_retirement = (retirement_age - current_age) * 12
+        monthly_growth_rate = annual_growth_rate / (12 * 100)
+        monthly_contribution = annual_contribution / 12
+        growth, annuity_factor, _ = compute_monthly_factors(monthly_growth_rate, months_to_retirement)
+        future_value = np.asarray(current_savings * growth + monthly_contribution * (1 + monthly_growth_rate) * annuity_factor)
+
+    future_value[errors != ERR_NONE] = np.nan
+    return future_value, errors
+
+def _retirement_balance(current_age, retirement_age, current_savings, annual_contribution, annual_growth_rate):
+    """One row of estimate_retirement_balance_batch, computed with math."""
+    if (current_age < 0 or retirement_age <= current_age or current_savings < 0
+            or annual_contribution < 0 or annual_growth_rate < 0):
+        return math.nan, ERR_INVALID_INPUT
+    monthly_growth_rate = annual_growth_rate / (12 * 100)
+    growth, annuity_factor, _ = _monthly_factors(monthly_growth_rate, (retirement_age - current_age) * 12)
+    monthly_contribution = annual_contribution / 12
+    return current_savings * growth + monthly_contribution * (1 + monthly_growth_rate) * annuity_factor, ERR_NONE
+
+@instrument('financial.estimate_retirement_balance')
+def estimate_retirement_balance(current_age, retirement_age, current_savings, annual_contribution, annual_growth_rate,
+                                backend='float'):
+    """Estimates retirement investment balance."""
+    _check_backend(backend)
+    if _is_real(current_age, retirement_age, current_savings, annual_contribution, annual_growth_rate):
+        future_value, error = _retirement_balance(
+            current_age, retirement_age, current_savings, annual_contribution, annual_growth_rate)
+    else:
+        future_value, error = estimate_retirement_balance_batch(
+            current_age, retirement_age, current_savings, annual_contribution, annual_growth_rate)
+    if error == ERR_INVALID_INPUT:
+        return "Error: Invalid input values."
+    if backend == 'decimal':
+        inputs = (current_age, retirement_age, current_savings, annual_contribution, annual_growth_rate)
+        message = FinancialDecimal.input_error(future_value, *inputs)
+        if message:
+            return message
+        future_value = FinancialDecimal.retirement_balance(*inputs)
+    return f"Estimated retirement balance: ${_format_amount(future_value)}"
+
+@instrument('financial.time_to_double_batch')
+def time_to_double_batch(initial_amount, rate, compounding_type='continuous'):
+    """Vectorized time_to_double. Returns (years, error_codes) arrays."""
+    initial_amount, rate = as_float_arrays(initial_amount, rate)
+    compounding = _as_compounding(compounding_type, rate.shape)
+    annually = compounding == 'annually'
+
+    errors = np.full(rate.shape, ERR_NONE, dtype=np.int8)
+    errors[annually & (rate / 100 >= 1)] = ERR_UNDEFINED
+    errors[~annually & (compounding != 'continuous')] = ERR_COMPOUNDING
+    errors[(initial_amount <= 0) | (rate <= 0)] = ERR_INVALID_INPUT
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        continuous_time = np.log(2) / (rate / 100)
+        annual_time = np.log(2) / np.log(1 + (rate / 100))
+        time_required = np.where(annually, annual_time, continuous_time)
+
+    time_required[errors != ERR_NONE] = np.nan
+    return time_required, errors
+
+def _time_to_double(initial_amount, rate, compounding_type):
+    """One row of time_to_double_batch, computed with math."""
+    compounding = compounding_type.lower()
+    if initial_amount <= 0 or rate <= 0:
+        return math.nan, ERR_INVALID_INPUT
+    if compounding == 'annually':
+        if rate / 100 >= 1:
+            return math.nan, ERR_UNDEFINED
+        return math.log(2) / math.log(1 + (rate / 100)), ERR_NONE
+    if compounding != 'continuous':
+        return math.nan, ERR_COMPOUNDING
+    return math.log(2) / (rate / 100), ERR_NONE
+
+@instrument('financial.time_to_double')
+def time_to_double(initial_amount, rate, compounding_type='continuous'):
+    """Determines how long until an amount doubles."""
+    if _is_real(initial_amount, rate) and isinstance(compounding_type, str):
+        time_required, error = _time_to_double(initial_amount, rate, compounding_type)
+    else:
+        time_required, error = time_to_double_batch(initial_amount, rate, compounding_type)
+    if error == ERR_INVALID_INPUT:
+        return "Error: Initial amount and rate must be positive."
+    if error == ERR_COMPOUNDING:
+        return "Error: Invalid compounding type. Choose 'continuous' or 'annually'."
+    if error == ERR_UNDEFINED:
+        return "Warning: At this rate, doubling occurs in the first year."
+    return f"Time to double ({compounding_type.lower()}): {float(time_required):.2f} years"
+
+@instrument('financial.solve_logarithmic_equation_batch')
+def solve_logarithmic_equation_batch(base, result):
+    """Vectorized solve_logarithmic_equation. Returns (exponents, error_codes) arrays."""
+    base, result = as_float_arrays(base, result)
+
+    errors = np.full(base.shape, ERR_NONE, dtype=np.int8)
+    errors[(base <= 0) | (base == 1) | (result <= 0)] = ERR_INVALID_INPUT
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        exponent = np.asarray(np.log(result) / np.log(base))
+
+    exponent[errors != ERR_NONE] = np.nan
+    return exponent, errors
+
+def _logarithm(base, result):
+    """One row of solve_logarithmic_equation_batch, computed with math."""
+    if base <= 0 or base == 1 or result <= 0:
+        return math.nan, ERR_INVALID_INPUT
+    return math.log(result) / math.log(base), ERR_NONE
+
+@instrument('financial.solve_logarithmic_equation')
+def solve_logarithmic_equation(base, result):
+    """Solves for x in log_base(result) = x."""
+    if _is_real(base, result):
+        exponent, error = _logarithm(base, result)
+    else:
+        exponent, error = solve_logarithmic_equation_batch(base, result)
+    if error == ERR_INVALID_INPUT:
+        return "Error: Base must be > 0 and not equal to 1, result must be > 0."
+    return f"Solution (exponent): {float(exponent):.2f}"
+
+def apply_batch(batch_function, frame, **columns):
+    """Runs a *_batch function over DataFrame columns.
+
+    Parameters are read from columns of the same name; pass name=column
+    keywords to map them to differently named columns. Returns a copy of
+    the frame with 'value' and 'error' columns added.
+    """
+    parameters = inspect.signature(batch_function).parameters
+    arguments = {}
+    for name in parameters:
+        column = columns.get(name, name)
+        if column in frame:
+            arguments[name] = frame[column]
+    values, errors = batch_function(**arguments)
+    return frame.assign(value=values, error=errors)
+
+@instrument('financial.to_scientific_notation')
+def to_scientific_notation(number):
+    """Converts a number to scientific notation."""
+    if number == 0:
+        return "0.0 * 10^0"
+    exponent = math.floor(math.log10(abs(number)))
+    coefficient = round(number * 10**(-exponent), 2)
+    return f"{coefficient} * 10^{exponent}"
+
+@instrument('financial.from_scientific_notation')
+def from_scientific_notation(coefficient_str, exponent_str):
+    """Converts from scientific notation to a regular number."""
+    try:
+        coefficient = float(coefficient_str)
+        exponent = int(exponent_str)
+        return coefficient * (10**exponent)
+    except ValueError:
+        return "Error: Invalid coefficient or exponent format."
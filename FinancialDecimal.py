@@ -0,0 +1,85 @@
+"""Decimal versions of the annuity, mortgage and retirement formulas.
+
+Inputs are read through their shortest decimal representation (0.1 is
+exactly one tenth), every step is carried out with PRECISION significant
+digits, and amounts are rounded to cents with banker's rounding
+(ROUND_HALF_EVEN), as ledger systems do. This is much slower than the
+float formulas in FinancialCore and is selected there with
+backend='decimal'. The functions here assume valid inputs; the FinancialCore
+functions check them first.
+"""
+import math
+from decimal import ROUND_HALF_EVEN, Decimal, localcontext
+
+PRECISION = 40
+CENT = Decimal('0.01')
+
+def to_decimal(value):
+    """Converts an int, float, str or Decimal to Decimal, reading floats as their shortest repr."""
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    return Decimal(str(value))
+
+def round_cents(amount):
+    """Rounds a finite Decimal amount to cents, halves to even."""
+    with localcontext() as context:
+        # quantize fails when the result has more digits than the precision allows.
+        context.prec = max(PRECISION, amount.adjusted() + 3)
+        return amount.quantize(CENT, rounding=ROUND_HALF_EVEN)
+
+def input_error(float_value, *inputs):
+    """Returns the error message for inputs the decimal formulas cannot evaluate, or None.
+
+    Infinities and NaN have no decimal value, and when float_value (the same
+    formula in floats) overflows the exact amount would run to hundreds of
+    digits.
+    """
+    if not all(math.isfinite(value) for value in inputs):
+        return "Error: Inputs must be finite numbers."
+    if not math.isfinite(float_value):
+        return "Error: Result is too large to calculate."
+    return None
+
+def _monthly_rate(rate):
+    return to_decimal(rate) / 1200  # annual percent to monthly decimal
+
+def annuity_value(principal, rate, time, compounding_type, monthly_contribution=0):
+    """Future value of calculate_annuity, as an unrounded Decimal."""
+    with localcontext() as context:
+        context.prec = PRECISION
+        principal, time, monthly_contribution = map(to_decimal, (principal, time, monthly_contribution))
+        if compounding_type.lower() == 'continuous':
+            return +(principal * (to_decimal(rate) / 100 * time).exp())
+        r_monthly = _monthly_rate(rate)
+        n_months = time * 12
+        if r_monthly == 0:
+            return +(principal + monthly_contribution * n_months)
+        growth = (1 + r_monthly) ** n_months
+        return +(principal * growth + monthly_contribution * (growth - 1) / r_monthly)
+
+def mortgage_payment(principal, rate, time):
+    """Monthly payment of calculate_mortgage_payment, as an unrounded Decimal."""
+    with localcontext() as context:
+        context.prec = PRECISION
+        principal, time = to_decimal(principal), to_decimal(time)
+        r_monthly = _monthly_rate(rate)
+        n_months = time * 12
+        if r_monthly == 0:
+            return +(principal / n_months) if n_months else +principal
+        growth = (1 + r_monthly) ** n_months
+        return +(principal * r_monthly * growth / (growth - 1))
+
+def retirement_balance(current_age, retirement_age, current_savings, annual_contribution, annual_growth_rate):
+    """Balance of estimate_retirement_balance, as an unrounded Decimal."""
+    with localcontext() as context:
+        context.prec = PRECISION
+        n_months = (to_decimal(retirement_age) - to_decimal(current_age)) * 12
+        current_savings = to_decimal(current_savings)
+        monthly_contribution = to_decimal(annual_contribution) / 12
+        r_monthly = _monthly_rate(annual_growth_rate)
+        if r_monthly == 0:
+            return +(current_savings + monthly_contribution * n_months)
+        growth = (1 + r_monthly) ** n_months
+        return +(current_savings * growth + monthly_contribution * (1 + r_monthly) * (growth - 1) / r_monthly)
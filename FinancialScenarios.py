@@ -0,0 +1,181 @@
+"""Sensitivity grids and Monte Carlo projections built on the FinancialCore formulas.
+
+The Monte Carlo functions simulate paths in chunks and reduce every chunk
+to per-year histograms of the balance before the next one starts, so memory
+depends on chunk_paths and the horizon, not on how many paths are drawn.
+"""
+import os
+
+import numpy as np
+
+from FinancialCore import (
+    ERR_NONE,
+    calculate_annuity,
+    calculate_annuity_batch,
+    compute_monthly_factors,
+    estimate_retirement_balance,
+    estimate_retirement_balance_batch,
+)
+from Instrumentation import instrument
+from ParallelMap import ordered_map
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+# Balances are binned on a log10 grid from one cent to 10^15, keeping each
+# bin's count and sum. A percentile reads back as the mean balance of the bin
+# it falls in, so it is within one bin width (about 0.24%) of the exact value,
+# and exact when every path has the same balance. Balances below a cent share
+# bin 0 and those above 10^15 share the last bin.
+_LOG_LOW = -2.0
+_LOG_HIGH = 15.0
+_BINS = 1 << 14
+_BIN_WIDTH = (_LOG_HIGH - _LOG_LOW) / (_BINS - 1)
+
+def sensitivity_grid(batch_function, axes, **fixed):
+    """Evaluates a *_batch formula over every combination of the axes values.
+
+    axes maps parameter names to 1-D sequences and fixed gives the other
+    parameters. Each axis gets its own dimension, in axes order, and the
+    formula broadcasts over them, e.g.
+
+        sensitivity_grid(estimate_retirement_balance_batch,
+                         {'annual_growth_rate': [4, 6, 8], 'annual_contribution': [3000, 6000]},
+                         current_age=30, retirement_age=65, current_savings=10000)
+
+    returns (values, errors) arrays of shape (3, 2).
+    """
+    names = list(axes)
+    grid = {
+        name: np.reshape(np.asarray(axes[name]), [-1 if i == j else 1 for j in range(len(names))])
+        for i, name in enumerate(names)
+    }
+    return batch_function(**fixed, **grid)
+
+def _bin_balances(balances):
+    """Maps balances of shape (years, paths) to flat (year, bin) histogram indices."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bins = np.floor((np.log10(balances) - _LOG_LOW) / _BIN_WIDTH) + 1
+    bins = np.clip(np.nan_to_num(bins, nan=0, neginf=0), 0, _BINS - 1).astype(np.int64)
+    bins += np.arange(balances.shape[0])[:, None] * _BINS
+    return bins.ravel()
+
+def _simulate_chunk(job):
+    """Simulates one chunk of paths; returns per-year histogram (counts, sums), each of shape (years+1, bins)."""
+    kind, n_paths, years, start, contribution, mean_rate, volatility, seed = job
+    rng = np.random.default_rng(seed)
+    balances = np.empty((years + 1, n_paths))
+    balances[0] = start
+    for year in range(1, years + 1):
+        rate = rng.normal(mean_rate, volatility, n_paths)
+        previous = balances[year - 1]
+        if kind == 'continuous':
+            balances[year] = previous * np.exp(rate / 100)
+            continue
+        # One year of the monthly formulas, at this year's drawn rate.
+        r_monthly = rate / (12 * 100)
+        growth, annuity_factor, _ = compute_monthly_factors(r_monthly, 12)
+        if kind == 'retirement':
+            annuity_factor = annuity_factor * (1 + r_monthly)  # contributions are made before growth
+        balances[year] = previous * growth + contribution * annuity_factor
+    bins = _bin_balances(balances)
+    size = (years + 1) * _BINS
+    counts = np.bincount(bins, minlength=size).reshape(years + 1, _BINS)
+    sums = np.bincount(bins, weights=balances.ravel(), minlength=size).reshape(years + 1, _BINS)
+    return counts, sums
+
+def _percentiles_from_histograms(counts, sums, percentiles):
+    """Reads percentiles (0-100) off per-year histograms; returns shape (len(percentiles), years+1)."""
+    cumulative = np.cumsum(counts, axis=1)
+    years = np.arange(counts.shape[0])
+    bands = np.empty((len(percentiles), counts.shape[0]))
+    for i, q in enumerate(percentiles):
+        # First bin whose cumulative count reaches the target rank, per year.
+        target = np.maximum(q / 100 * cumulative[:, -1], 1)
+        k = (cumulative < target[:, None]).sum(axis=1)
+        bands[i] = sums[years, k] / counts[years, k]
+    return bands
+
+def _run_simulation(kind, n_paths, years, start, contribution, mean_rate, volatility,
+                    percentiles, seed, chunk_paths, workers):
+    if volatility < 0:
+        raise ValueError("Error: Volatility cannot be negative.")
+    if n_paths < 1:
+        raise ValueError("Error: At least one path must be simulated.")
+    chunk_seeds = np.random.SeedSequence(seed).spawn(-(-n_paths // chunk_paths))
+    jobs = [(kind, min(chunk_paths, n_paths - first), years, start, contribution, mean_rate, volatility, chunk_seed)
+            for first, chunk_seed in zip(range(0, n_paths, chunk_paths), chunk_seeds)]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+
+    counts = np.zeros((years + 1, _BINS), dtype=np.int64)
+    sums = np.zeros((years + 1, _BINS))
+    for chunk_counts, chunk_sums in ordered_map(_simulate_chunk, jobs, workers):
+        counts += chunk_counts
+        sums += chunk_sums
+
+    return {
+        'year': np.arange(years + 1),
+        'percentiles': np.asarray(percentiles, dtype=float),
+        'bands': _percentiles_from_histograms(counts, sums, percentiles),
+        'mean': sums.sum(axis=1) / n_paths,
+    }
+
+def _whole_years(years, name):
+    if years != int(years) or years < 1:
+        raise ValueError(f"Error: {name} must be a whole number of years for a Monte Carlo projection.")
+    return int(years)
+
+@instrument('financial.simulate_retirement')
+def simulate_retirement(current_age, retirement_age, current_savings, annual_contribution, mean_growth_rate,
+                        volatility, n_paths=100000, percentiles=DEFAULT_PERCENTILES, seed=None,
+                        chunk_paths=50000, workers=None):
+    """Monte Carlo version of estimate_retirement_balance with a random growth rate each year.
+
+    Each year's annual growth rate (in percent) is drawn from a normal
+    distribution with mean mean_growth_rate and standard deviation
+    volatility, and that year's twelve months follow the
+    estimate_retirement_balance formula at that rate. Paths are simulated
+    chunk_paths at a time, in a pool of workers processes (all cores by
+    default); a seeded run gives the same result for any number of workers.
+
+    Returns a dict with 'year' (0 to the horizon), 'percentiles', 'bands'
+    (the balance at each percentile and year, shape (len(percentiles),
+    years + 1)), 'mean' (the mean balance per year) and 'deterministic' (the
+    formula at mean_growth_rate). Invalid inputs raise ValueError with the
+    formula's error message.
+    """
+    _, error = estimate_retirement_balance_batch(current_age, retirement_age, current_savings,
+                                                 annual_contribution, mean_growth_rate)
+    if error != ERR_NONE:
+        raise ValueError(estimate_retirement_balance(current_age, retirement_age, current_savings,
+                                                     annual_contribution, mean_growth_rate))
+    years = _whole_years(retirement_age - current_age, "The time to retirement")
+
+    result = _run_simulation('retirement', n_paths, years, float(current_savings), annual_contribution / 12,
+                             mean_growth_rate, volatility, percentiles, seed, chunk_paths, workers)
+    deterministic, _ = estimate_retirement_balance_batch(current_age, current_age + result['year'][1:],
+                                                         current_savings, annual_contribution, mean_growth_rate)
+    result['deterministic'] = np.concatenate([[float(current_savings)], deterministic])
+    return result
+
+@instrument('financial.simulate_annuity')
+def simulate_annuity(principal, mean_rate, volatility, time, compounding_type='monthly', monthly_contribution=0,
+                     n_paths=100000, percentiles=DEFAULT_PERCENTILES, seed=None, chunk_paths=50000, workers=None):
+    """Monte Carlo version of calculate_annuity with a random interest rate each year.
+
+    Each year's annual rate (in percent) is drawn from a normal distribution
+    with mean mean_rate and standard deviation volatility, and that year
+    compounds by the calculate_annuity formula at that rate. The result is
+    laid out as for simulate_retirement.
+    """
+    _, error = calculate_annuity_batch(principal, mean_rate, time, compounding_type, monthly_contribution)
+    if error != ERR_NONE:
+        raise ValueError(calculate_annuity(principal, mean_rate, time, compounding_type, monthly_contribution))
+    years = _whole_years(time, "The time period")
+    kind = 'continuous' if compounding_type.lower() == 'continuous' else 'annuity'
+
+    result = _run_simulation(kind, n_paths, years, float(principal), float(monthly_contribution),
+                             mean_rate, volatility, percentiles, seed, chunk_paths, workers)
+    deterministic, _ = calculate_annuity_batch(principal, mean_rate, result['year'], compounding_type,
+                                               monthly_contribution)
+    result['deterministic'] = deterministic
+    return result
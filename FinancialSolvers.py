@@ -0,0 +1,258 @@
+"""Inverse (goal-seeking) versions of the annuity, mortgage and retirement formulas.
+
+Each *_batch solver answers one question for whole arrays of inputs and,
+like the forward formulas, returns (values, error_codes): the rate that
+makes an annuity or retirement balance reach a target, the rate or term
+behind a mortgage payment, or the contribution needed to retire with a
+target balance. Rates have no closed form; they are found with Newton's
+method on the forward formula, using its analytic derivative, inside a
+bracket that falls back to bisection whenever a Newton step would leave it.
+Terms and contributions are solved in closed form.
+"""
+import numpy as np
+
+from FinancialCore import (
+    ERR_INVALID_INPUT,
+    ERR_NONE,
+    ERR_UNDEFINED,
+    as_float_arrays,
+    compute_monthly_factors,
+)
+from Instrumentation import instrument
+
+# Rates are searched between 0 and this monthly rate (1200% a year).
+MAX_MONTHLY_RATE = 1.0
+RELATIVE_TOLERANCE = 1e-12
+MAX_ITERATIONS = 100
+
+def _factors_and_derivatives(r, n):
+    """Returns growth g, annuity factor A and present value factor V of monthly rate r over n months,
+    with their derivatives with respect to r, as (g, A, V, dg, dA, dV)."""
+    g, A, V = compute_monthly_factors(r, n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dg = n * g / (1 + r)
+        # At r = 0 the factors are polynomials in n; their slopes there are exact.
+        small = np.abs(r) < 1e-9
+        dA = np.where(small, n * (n - 1) / 2, (dg - A) / r)
+        dV = np.where(small, -n * (n + 1) / 2, (n * np.exp(-(n + 1) * np.log1p(r)) - V) / r)
+    return g, A, V, dg, dA, dV
+
+def _solve_monthly_rate(value_and_slope, target, initial_rate=0.005):
+    """Finds the monthly rate r >= 0 with value(r) = target for every row.
+
+    value_and_slope(r, rows) evaluates the forward formula and its
+    derivative for the given rows; it must be positive and increase with r.
+    Newton's method runs on log(value), which is close to linear in r for
+    compound growth, so long horizons converge as fast as short ones. As in
+    rtsafe, a step that leaves the bracket or does not at least halve the
+    previous one is replaced by bisection. Rows with no solution between 0
+    and MAX_MONTHLY_RATE come back as NaN; only rows that have not converged
+    are evaluated in each iteration.
+    """
+    rows = np.arange(target.size)
+    rates = np.full(target.size, np.nan)
+
+    at_zero, _ = value_and_slope(np.zeros(target.size), rows)
+    at_max, _ = value_and_slope(np.full(target.size, MAX_MONTHLY_RATE), rows)
+    rates[at_zero == target] = 0.0
+    rows = rows[(at_zero < target) & (at_max >= target)]
+
+    log_target = np.log(target[rows])
+    low = np.zeros(rows.size)
+    high = np.full(rows.size, MAX_MONTHLY_RATE)
+    r = np.clip(np.full(rows.size, initial_rate), low, high)
+    last_step = high - low
+    for _ in range(MAX_ITERATIONS):
+        if rows.size == 0:
+            break
+        value, slope = value_and_slope(r, rows)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            residual = np.log(value) - log_target
+            newton_step = residual * value / slope  # residual over d log(value) / dr
+        converged = (np.abs(residual) <= RELATIVE_TOLERANCE) | (high - low <= RELATIVE_TOLERANCE * high)
+        rates[rows[converged]] = r[converged]
+
+        low = np.where(residual < 0, r, low)
+        high = np.where(residual > 0, r, high)
+        step = r - newton_step
+        usable = np.isfinite(step) & (step > low) & (step < high) & (np.abs(newton_step) <= last_step / 2)
+        step = np.where(usable, step, (low + high) / 2)
+        last_step = np.abs(step - r)
+
+        keep = ~converged
+        rows, log_target, low, high, r, last_step = (
+            rows[keep], log_target[keep], low[keep], high[keep], step[keep], last_step[keep])
+    rates[rows] = r  # out of iterations: the bracket is already narrow
+    return rates
+
+def _finish(values, errors, shape):
+    values = values.reshape(shape)
+    errors[(errors == ERR_NONE) & np.isnan(values)] = ERR_UNDEFINED
+    values[errors != ERR_NONE] = np.nan
+    return values, errors
+
+@instrument('financial.solve_annuity_rate_batch')
+def solve_annuity_rate_batch(principal, time, target_value, monthly_contribution=0):
+    """Annual rate (in percent, monthly compounding) at which calculate_annuity reaches target_value.
+
+    Returns (rates, error_codes); ERR_UNDEFINED marks targets no rate
+    between 0% and 1200% reaches, such as one below the zero-rate value.
+    """
+    principal, time, target_value, monthly_contribution = as_float_arrays(
+        principal, time, target_value, monthly_contribution)
+    shape = principal.shape
+    errors = np.full(shape, ERR_NONE, dtype=np.int8)
+    errors[(principal < 0) | (time < 0) | (target_value < 0) | (monthly_contribution < 0)] = ERR_INVALID_INPUT
+
+    P, n, m, target = (a.ravel() for a in (principal, time * 12, monthly_contribution, target_value))
+
+    def value_and_slope(r, rows):
+        g, A, _, dg, dA, _ = _factors_and_derivatives(r, n[rows])
+        return P[rows] * g + m[rows] * A, P[rows] * dg + m[rows] * dA
+
+    return _finish(_solve_monthly_rate(value_and_slope, target) * 1200, errors, shape)
+
+@instrument('financial.solve_annuity_rate')
+def solve_annuity_rate(principal, time, target_value, monthly_contribution=0):
+    """Finds the annual rate at which a monthly annuity grows to target_value."""
+    rate, error = solve_annuity_rate_batch(principal, time, target_value, monthly_contribution)
+    if error == ERR_INVALID_INPUT:
+        return "Error: Inputs cannot be negative."
+    if error == ERR_UNDEFINED:
+        return "Error: No rate between 0% and 1200% reaches the target."
+    return f"Required annual rate: {float(rate):.4f}%"
+
+@instrument('financial.solve_retirement_rate_batch')
+def solve_retirement_rate_batch(current_age, retirement_age, current_savings, annual_contribution, target_balance):
+    """Annual growth rate (in percent) at which estimate_retirement_balance reaches target_balance.
+
+    Returns (rates, error_codes), with ERR_UNDEFINED where no rate between
+    0% and 1200% reaches the target.
+    """
+    current_age, retirement_age, current_savings, annual_contribution, target_balance = as_float_arrays(
+        current_age, retirement_age, current_savings, annual_contribution, target_balance)
+    shape = current_age.shape
+    errors = np.full(shape, ERR_NONE, dtype=np.int8)
+    errors[(current_age < 0) | (retirement_age <= current_age) | (current_savings < 0)
+           | (annual_contribution < 0) | (target_balance < 0)] = ERR_INVALID_INPUT
+
+    S, n, m, target = (a.ravel() for a in (current_savings, (retirement_age - current_age) * 12,
+                                           annual_contribution / 12, target_balance))
+
+    def value_and_slope(r, rows):
+        g, A, _, dg, dA, _ = _factors_and_derivatives(r, n[rows])
+        value = S[rows] * g + m[rows] * (1 + r) * A
+        slope = S[rows] * dg + m[rows] * (A + (1 + r) * dA)
+        return value, slope
+
+    return _finish(_solve_monthly_rate(value_and_slope, target) * 1200, errors, shape)
+
+@instrument('financial.solve_retirement_rate')
+def solve_retirement_rate(current_age, retirement_age, current_savings, annual_contribution, target_balance):
+    """Finds the annual growth rate needed to retire with target_balance."""
+    rate, error = solve_retirement_rate_batch(current_age, retirement_age, current_savings, annual_contribution,
+                                              target_balance)
+    if error == ERR_INVALID_INPUT:
+        return "Error: Invalid input values."
+    if error == ERR_UNDEFINED:
+        return "Error: No rate between 0% and 1200% reaches the target."
+    return f"Required annual growth rate: {float(rate):.4f}%"
+
+@instrument('financial.solve_mortgage_rate_batch')
+def solve_mortgage_rate_batch(principal, time, monthly_payment):
+    """Annual rate (in percent) at which calculate_mortgage_payment gives monthly_payment.
+
+    Returns (rates, error_codes), with ERR_UNDEFINED where the payment is
+    below the interest-free payment or needs a rate above 1200%.
+    """
+    principal, time, monthly_payment = as_float_arrays(principal, time, monthly_payment)
+    shape = principal.shape
+    errors = np.full(shape, ERR_NONE, dtype=np.int8)
+    errors[(principal < 0) | (time <= 0) | (monthly_payment < 0)] = ERR_INVALID_INPUT
+
+    P, n, target = (a.ravel() for a in (principal, time * 12, monthly_payment))
+
+    def value_and_slope(r, rows):
+        _, _, V, _, _, dV = _factors_and_derivatives(r, n[rows])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return P[rows] / V, -P[rows] * dV / (V * V)
+
+    return _finish(_solve_monthly_rate(value_and_slope, target) * 1200, errors, shape)
+
+@instrument('financial.solve_mortgage_rate')
+def solve_mortgage_rate(principal, time, monthly_payment):
+    """Finds the annual rate behind a monthly mortgage payment."""
+    rate, error = solve_mortgage_rate_batch(principal, time, monthly_payment)
+    if error == ERR_INVALID_INPUT:
+        return "Error: Inputs cannot be negative and the term must be positive."
+    if error == ERR_UNDEFINED:
+        return "Error: No rate between 0% and 1200% gives this payment."
+    return f"Mortgage rate: {float(rate):.4f}%"
+
+@instrument('financial.solve_mortgage_term_batch')
+def solve_mortgage_term_batch(principal, rate, monthly_payment):
+    """Term in years for which calculate_mortgage_payment gives monthly_payment.
+
+    Solves P = payment * (1 - (1+r)^-n) / r for n. Returns (terms,
+    error_codes), with ERR_UNDEFINED where the payment never covers the
+    monthly interest. Terms are fractional; the last payment is partial.
+    """
+    principal, rate, monthly_payment = as_float_arrays(principal, rate, monthly_payment)
+    errors = np.full(principal.shape, ERR_NONE, dtype=np.int8)
+    errors[(principal < 0) | (rate < 0) | (monthly_payment <= 0)] = ERR_INVALID_INPUT
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r_monthly = rate / (12 * 100)
+        n_months = np.where(r_monthly == 0, principal / monthly_payment,
+                            -np.log1p(-r_monthly * principal / monthly_payment) / np.log1p(r_monthly))
+        terms = np.asarray(n_months / 12)
+
+    errors[(errors == ERR_NONE) & ~np.isfinite(terms)] = ERR_UNDEFINED
+    terms[errors != ERR_NONE] = np.nan
+    return terms, errors
+
+@instrument('financial.solve_mortgage_term')
+def solve_mortgage_term(principal, rate, monthly_payment):
+    """Finds how many years a monthly payment takes to repay a loan."""
+    term, error = solve_mortgage_term_batch(principal, rate, monthly_payment)
+    if error == ERR_INVALID_INPUT:
+        return "Error: Inputs cannot be negative and the payment must be positive."
+    if error == ERR_UNDEFINED:
+        return "Error: The payment does not cover the monthly interest."
+    return f"Loan term: {float(term):.2f} years"
+
+@instrument('financial.solve_retirement_contribution_batch')
+def solve_retirement_contribution_batch(current_age, retirement_age, current_savings, target_balance,
+                                        annual_growth_rate):
+    """Annual contribution for which estimate_retirement_balance reaches target_balance.
+
+    The balance is linear in the contribution, so this is closed form.
+    Returns (contributions, error_codes); savings that already grow to the
+    target need a contribution of 0.
+    """
+    current_age, retirement_age, current_savings, target_balance, annual_growth_rate = as_float_arrays(
+        current_age, retirement_age, current_savings, target_balance, annual_growth_rate)
+    errors = np.full(current_age.shape, ERR_NONE, dtype=np.int8)
+    errors[(current_age < 0) | (retirement_age <= current_age) | (current_savings < 0)
+           | (target_balance < 0) | (annual_growth_rate < 0)] = ERR_INVALID_INPUT
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        r_monthly = annual_growth_rate / (12 * 100)
+        growth, annuity_factor, _ = compute_monthly_factors(r_monthly, (retirement_age - current_age) * 12)
+        shortfall = np.maximum(target_balance - current_savings * growth, 0)
+        contributions = np.asarray(12 * shortfall / ((1 + r_monthly) * annuity_factor))
+
+    errors[(errors == ERR_NONE) & ~np.isfinite(contributions)] = ERR_UNDEFINED
+    contributions[errors != ERR_NONE] = np.nan
+    return contributions, errors
+
+@instrument('financial.solve_retirement_contribution')
+def solve_retirement_contribution(current_age, retirement_age, current_savings, target_balance, annual_growth_rate):
+    """Finds the annual contribution needed to retire with target_balance."""
+    contribution, error = solve_retirement_contribution_batch(current_age, retirement_age, current_savings,
+                                                              target_balance, annual_growth_rate)
+    if error == ERR_INVALID_INPUT:
+        return "Error: Invalid input values."
+    if error == ERR_UNDEFINED:
+        return "Error: Cannot calculate the contribution for these values."
+    return f"Required annual contribution: ${float(contribution):.2f}"
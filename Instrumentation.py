@@ -0,0 +1,136 @@
+"""Opt-in timers and counters for the calculator, explorer and games.
+
+Instrumentation is off by default; the hooks then cost one global check per
+call. Turn it on with enable(), or by setting COLLEGE_ALGEBRA_INSTRUMENT
+before starting a program: "1" just collects, while a path ending in .json
+or .prom also writes a report there when the program exits. Measurements
+are per process, so work done in process-pool workers is not included.
+"""
+import atexit
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+_enabled = False
+_lock = threading.Lock()
+_timers = {}  # name -> [count, total seconds, max seconds]
+_counters = {}  # name -> total
+
+_NULL_TIMER = contextlib.nullcontext()
+
+def enable():
+    global _enabled
+    _enabled = True
+
+def disable():
+    global _enabled
+    _enabled = False
+
+def is_enabled():
+    return _enabled
+
+def reset():
+    """Drops every recorded measurement."""
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+
+def _record(name, seconds):
+    with _lock:
+        entry = _timers.get(name)
+        if entry is None:
+            _timers[name] = [1, seconds, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            if seconds > entry[2]:
+                entry[2] = seconds
+
+class _Timer:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        _record(self.name, time.perf_counter() - self.start)
+
+def timed(name):
+    """Context manager that records the time spent in its block under name."""
+    return _Timer(name) if _enabled else _NULL_TIMER
+
+def instrument(name):
+    """Decorator that records every call of the function under name."""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                _record(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+def count(name, value=1):
+    """Adds value to the counter name."""
+    if _enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + value
+
+def snapshot():
+    """Returns the measurements as {'timers': {...}, 'counters': {...}}."""
+    with _lock:
+        timers = {
+            name: {
+                'count': calls,
+                'total_seconds': total,
+                'mean_seconds': total / calls,
+                'max_seconds': longest,
+            }
+            for name, (calls, total, longest) in _timers.items()
+        }
+        return {'timers': timers, 'counters': dict(_counters)}
+
+def export_json():
+    return json.dumps(snapshot(), indent=2, sort_keys=True)
+
+def export_prometheus(prefix='college_algebra'):
+    """Returns the measurements in the Prometheus text exposition format."""
+    data = snapshot()
+    lines = [
+        f"# HELP {prefix}_duration_seconds Time spent per instrumented operation.",
+        f"# TYPE {prefix}_duration_seconds summary",
+    ]
+    for name, timer in sorted(data['timers'].items()):
+        lines.append(f'{prefix}_duration_seconds_sum{{operation="{name}"}} {timer["total_seconds"]!r}')
+        lines.append(f'{prefix}_duration_seconds_count{{operation="{name}"}} {timer["count"]}')
+    lines.append(f"# HELP {prefix}_duration_seconds_max Longest single call per instrumented operation.")
+    lines.append(f"# TYPE {prefix}_duration_seconds_max gauge")
+    for name, timer in sorted(data['timers'].items()):
+        lines.append(f'{prefix}_duration_seconds_max{{operation="{name}"}} {timer["max_seconds"]!r}')
+    lines.append(f"# HELP {prefix}_events_total Instrumented event counts.")
+    lines.append(f"# TYPE {prefix}_events_total counter")
+    for name, total in sorted(data['counters'].items()):
+        lines.append(f'{prefix}_events_total{{name="{name}"}} {total}')
+    return "\n".join(lines) + "\n"
+
+def write_report(path):
+    """Writes the measurements to path, as Prometheus text for .prom files and JSON otherwise."""
+    with open(path, 'w') as handle:
+        handle.write(export_prometheus() if path.endswith('.prom') else export_json())
+
+_setting = os.environ.get('COLLEGE_ALGEBRA_INSTRUMENT', '')
+if _setting and _setting != '0':
+    enable()
+    if _setting.endswith(('.json', '.prom')):
+        atexit.register(write_report, _setting)
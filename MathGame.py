@@ -2,7 +2,250 @@ import random
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.widgets import Slider, Button
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Rectangle
+import matplotlib.image as mpimg
+import csv
+import json
+import os
 import sys
+import time
+from collections import OrderedDict
+from io import BytesIO
+from Instrumentation import count, timed
+from ParallelMap import ordered_map
+
+# Axis half-width of the scatter board per difficulty; anything else plays as hard.
+SCATTER_SIZES = {'easy': 10, 'medium': 20, 'hard': 50}
+
+def new_scatter_points(difficulty, rng=random):
+    """Draws a scatter board: returns (size, x_coords, y_coords) with 3 to 7 points."""
+    size = SCATTER_SIZES.get(difficulty, SCATTER_SIZES['hard'])
+    with timed('mathgame.scatter.generate'):
+        num_points = rng.randint(3, 7)
+        x_coords = [rng.randint(-size, size) for _ in range(num_points)]
+        y_coords = [rng.randint(-size, size) for _ in range(num_points)]
+    count('mathgame.problems_generated')
+    return size, x_coords, y_coords
+
+def parse_point(answer):
+    """Reads an 'x,y' answer as a pair of ints, raising ValueError if it is malformed."""
+    x, y = map(int, answer.split(','))
+    return x, y
+
+# Wall of the projectile game: its center is drawn from WALL_X_RANGE and its
+# height from WALL_HEIGHT_RANGE.
+WALL_X_RANGE = (3, 7)
+WALL_HEIGHT_RANGE = (1, 4)
+WALL_WIDTH = 0.2
+
+def new_wall(rng=random):
+    """Draws a wall for the projectile game: returns (wall_x, wall_height)."""
+    return rng.uniform(*WALL_X_RANGE), rng.uniform(*WALL_HEIGHT_RANGE)
+
+def wall_clearance(a, b, c, wall_x, wall_height, wall_width=WALL_WIDTH):
+    """Lowest height of y = ax² + bx + c over the wall's width, minus the wall's height.
+
+    Positive values clear the wall. The lowest point is at one of the wall's
+    edges, or at the vertex when the parabola opens upward and its vertex
+    lies over the wall, so no sampling is needed. All arguments broadcast,
+    so one call grades any number of attempts against any number of walls.
+    """
+    a, b, c, wall_x, wall_height, wall_width = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in (a, b, c, wall_x, wall_height, wall_width)))
+    left = wall_x - wall_width / 2
+    right = wall_x + wall_width / 2
+    lowest = np.minimum((a * left + b) * left + c, (a * right + b) * right + c)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vertex_x = -b / (2 * a)
+        vertex_inside = (a > 0) & (vertex_x > left) & (vertex_x < right)
+        lowest = np.where(vertex_inside, np.minimum(lowest, c - b * b / (4 * a)), lowest)
+    return lowest - wall_height
+
+def grade_attempts(a, b, c, wall_x, wall_height, wall_width=WALL_WIDTH):
+    """Boolean array of which parabolas y = ax² + bx + c clear their walls; arguments broadcast."""
+    with timed('mathgame.projectile.grade'):
+        return wall_clearance(a, b, c, wall_x, wall_height, wall_width) > 0
+
+def clears_wall(a, b, c, wall_x, wall_height):
+    """Whether y = ax² + bx + c passes above the wall across its whole width.
+
+    The wall_clearance test for one attempt, in plain Python so a single
+    check does not pay for array setup.
+    """
+    left = wall_x - WALL_WIDTH / 2
+    right = wall_x + WALL_WIDTH / 2
+    lowest = min((a * left + b) * left + c, (a * right + b) * right + c)
+    if a > 0 and left < -b / (2 * a) < right:
+        lowest = min(lowest, c - b * b / (4 * a))
+    return bool(lowest - wall_height > 0)
+
+def _new_figure():
+    """A figure drawn by the Agg canvas directly, with no pyplot or display state."""
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    return fig
+
+def _png_bytes(fig):
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png')
+    return buffer.getvalue()
+
+def scatter_board(difficulty, seed):
+    """The scatter board that seed draws at difficulty, as (size, x_coords, y_coords)."""
+    return new_scatter_points(difficulty, random.Random(seed))
+
+def _scatter_title(num_points):
+    return f"Identify the coordinates of the {num_points} red points"
+
+class ScatterBoardRenderer:
+    """Renders scatter boards to PNG by blitting the points onto prepared backgrounds.
+
+    Each board size gets one figure, drawn once per point count (the count
+    is in the title); its pixels are kept as a background. A board then
+    costs a restore of that background, one draw of the points and the PNG
+    encoding. Boards requested by (difficulty, seed) are kept in a
+    least-recently-used cache of max_boards entries and, when directory is
+    set, read from the files prerender() wrote there.
+    """
+
+    def __init__(self, max_boards=1024, directory=None):
+        self.max_boards = max_boards
+        self.directory = directory
+        self._figures = {}  # size -> (fig, ax, points)
+        self._backgrounds = {}  # (size, num_points) -> saved pixels
+        self._boards = OrderedDict()  # (difficulty, seed) -> PNG bytes
+
+    def _figure(self, size):
+        if size not in self._figures:
+            fig = _new_figure()
+            ax = fig.add_subplot()
+            points = ax.scatter([], [], color='red', animated=True)
+            ax.set_xlabel("X-axis")
+            ax.set_ylabel("Y-axis")
+            ax.grid(True)
+            ax.set_xlim(-size-1, size+1)
+            ax.set_ylim(-size-1, size+1)
+            ax.axhline(0, color='black', linewidth=0.5)
+            ax.axvline(0, color='black', linewidth=0.5)
+            self._figures[size] = (fig, ax, points)
+        return self._figures[size]
+
+    def _background(self, size, num_points):
+        key = (size, num_points)
+        if key not in self._backgrounds:
+            fig, ax, _ = self._figure(size)
+            ax.set_title(_scatter_title(num_points))
+            fig.canvas.draw()
+            self._backgrounds[key] = fig.canvas.copy_from_bbox(fig.bbox)
+        return self._backgrounds[key]
+
+    def render(self, size, x_coords, y_coords):
+        """Renders the board with the given points as PNG bytes."""
+        with timed('mathgame.scatter.render'):
+            fig, ax, points = self._figure(size)
+            background = self._background(size, len(x_coords))
+            canvas = fig.canvas
+            canvas.restore_region(background)
+            points.set_offsets(np.column_stack([x_coords, y_coords]))
+            ax.draw_artist(points)
+            buffer = BytesIO()
+            mpimg.imsave(buffer, np.asarray(canvas.buffer_rgba()), format='png')
+            return buffer.getvalue()
+
+    def _path(self, difficulty, seed):
+        return os.path.join(self.directory, f"scatter-{difficulty}-{seed}.png")
+
+    def board(self, difficulty, seed):
+        """Returns the PNG of scatter_board(difficulty, seed), from the cache when possible."""
+        difficulty = difficulty if difficulty in SCATTER_SIZES else 'hard'
+        key = (difficulty, seed)
+        png = self._boards.get(key)
+        if png is not None:
+            self._boards.move_to_end(key)
+            count('mathgame.scatter.cache_hit')
+            return png
+        if self.directory is not None and os.path.exists(self._path(difficulty, seed)):
+            with open(self._path(difficulty, seed), 'rb') as handle:
+                png = handle.read()
+        else:
+            png = self.render(*scatter_board(difficulty, seed))
+        self._boards[key] = png
+        if len(self._boards) > self.max_boards:
+            self._boards.popitem(last=False)
+        return png
+
+    def prerender(self, difficulty, seeds):
+        """Writes the boards for seeds to directory and returns their paths."""
+        os.makedirs(self.directory, exist_ok=True)
+        paths = []
+        for seed in seeds:
+            path = self._path(difficulty, seed)
+            with open(path, 'wb') as handle:
+                handle.write(self.render(*scatter_board(difficulty, seed)))
+            paths.append(path)
+        return paths
+
+# The renderer used by render_scatter_png and render_scatter_board; each
+# process, including pool workers, builds its own on first use.
+_scatter_renderer = None
+
+def configure_scatter_boards(directory=None, max_boards=1024):
+    """Replaces this process's shared scatter renderer, e.g. to read pre-rendered boards."""
+    global _scatter_renderer
+    _scatter_renderer = ScatterBoardRenderer(max_boards, directory)
+
+def _shared_scatter_renderer():
+    if _scatter_renderer is None:
+        configure_scatter_boards()
+    return _scatter_renderer
+
+def render_scatter_png(size, x_coords, y_coords):
+    """Renders a scatter board the way scatter_plot_game shows it, as PNG bytes."""
+    return _shared_scatter_renderer().render(size, x_coords, y_coords)
+
+def render_scatter_board(difficulty, seed):
+    """Renders scatter_board(difficulty, seed) as PNG bytes, cached per process."""
+    return _shared_scatter_renderer().board(difficulty, seed)
+
+def _prerender_chunk(args):
+    directory, difficulty, seeds = args
+    return ScatterBoardRenderer(0, directory).prerender(difficulty, seeds)
+
+def prerender_scatter_boards(directory, difficulty, seeds, workers=1, chunk_size=256):
+    """Writes the boards for seeds at difficulty to directory ahead of time.
+
+    A renderer configured with the same directory then serves those boards
+    from disk. With workers > 1 the seeds are rendered in a process pool.
+    Returns the number of boards written.
+    """
+    seeds = list(seeds)
+    chunks = [(directory, difficulty, seeds[i:i + chunk_size]) for i in range(0, len(seeds), chunk_size)]
+    workers = workers if len(chunks) > 1 else 1
+    return sum(len(paths) for paths in ordered_map(_prerender_chunk, chunks, workers))
+
+# Starting (a, b, c) of the projectile game's parabola; anything but easy uses the hard start.
+PROJECTILE_START = {'easy': (-0.5, 3, 0), 'hard': (-1, 5, 0)}
+
+def render_projectile_png(wall_x, wall_height, a, b, c, attempt=False):
+    """Renders the projectile board with the parabola y = ax² + bx + c, as PNG bytes.
+
+    attempt draws the board shown after the player answers rather than the starting one.
+    """
+    with timed('mathgame.projectile.render'):
+        fig = _new_figure()
+        ax = fig.add_subplot()
+        x = np.linspace(0, 10, 500)
+        ax.plot(x, a * x**2 + b * x + c, lw=2, color='green' if attempt else None)
+        ax.add_patch(Rectangle((wall_x - WALL_WIDTH/2, 0), WALL_WIDTH, wall_height, fc='red', ec='black'))
+        ax.set_title('Your parabola attempt' if attempt else 'Adjust the parabola to clear the wall')
+        ax.set_xlabel('Distance')
+        ax.set_ylabel('Height')
+        ax.grid(True)
+        ax.set_xlim(0, 10)
+        ax.set_ylim(0, 10)
+        return _png_bytes(fig)
 
 def scatter_plot_game():
     print("\nScatter Plot Game")
@@ -10,28 +253,22 @@ def scatter_plot_game():
 
     # Difficulty selection
     difficulty = input("Choose difficulty (easy/medium/hard): ").lower()
-    if difficulty == "easy":
-        size = 10
-    elif difficulty == "medium":
-        size = 20
-    else:  # hard
-        size = 50
 
     # Generate random points
-    num_points = random.randint(3, 7)
-    x_coords = [random.randint(-size, size) for _ in range(num_points)]
-    y_coords = [random.randint(-size, size) for _ in range(num_points)]
+    size, x_coords, y_coords = new_scatter_points(difficulty)
+    num_points = len(x_coords)
 
     # Create scatter plot
-    plt.scatter(x_coords, y_coords, color='red')
-    plt.title(f"Identify the coordinates of the {num_points} red points")
-    plt.xlabel("X-axis")
-    plt.ylabel("Y-axis")
-    plt.grid(True)
-    plt.xlim(-size-1, size+1)
-    plt.ylim(-size-1, size+1)
-    plt.axhline(0, color='black', linewidth=0.5)
-    plt.axvline(0, color='black', linewidth=0.5)
+    with timed('mathgame.scatter.render'):
+        plt.scatter(x_coords, y_coords, color='red')
+        plt.title(f"Identify the coordinates of the {num_points} red points")
+        plt.xlabel("X-axis")
+        plt.ylabel("Y-axis")
+        plt.grid(True)
+        plt.xlim(-size-1, size+1)
+        plt.ylim(-size-1, size+1)
+        plt.axhline(0, color='black', linewidth=0.5)
+        plt.axvline(0, color='black', linewidth=0.5)
     plt.show()
 
     # Get user answers
@@ -40,7 +277,7 @@ def scatter_plot_game():
         while True:
             try:
                 answer = input(f"Enter coordinates for point {i+1} as x,y: ")
-                x, y = map(int, answer.split(','))
+                x, y = parse_point(answer)
                 if (x, y) == (x_coords[i], y_coords[i]):
                     print("Correct!")
                     score += 1
@@ -52,73 +289,122 @@ def scatter_plot_game():
 
     print(f"\nGame over! Your score: {score}/{num_points}")
 
+# Largest |b|, |c|, |d| per difficulty; anything else plays as hard.
+ALGEBRA_MAX_NUM = {'easy': 10, 'medium': 20, 'hard': 50}
+
+def _term(coeff, var):
+    if coeff == 1:
+        return var
+    elif coeff == -1:
+        return f"-{var}"
+    else:
+        return f"{coeff}{var}"
+
+def format_algebra_equation(two_step, a, b, c, d=0):
+    """Formats ax + b = c (one-step) or ax + b = cx + d (two-step) the way the game shows it."""
+    if not two_step:
+        if a == 1:
+            return f"x + {b} = {c}"
+        elif a == -1:
+            return f"-x + {b} = {c}"
+        else:
+            return f"{a}x + {b} = {c}"
+    left = f"{_term(a, 'x')} + {b}" if b >= 0 else f"{_term(a, 'x')} - {-b}"
+    right = f"{_term(c, 'x')} + {d}" if d >= 0 else f"{_term(c, 'x')} - {-d}"
+    return f"{left} = {right}"
+
+def generate_algebra_problems(n, difficulty='easy', seed=None):
+    """Generates n algebra problems in one vectorized pass.
+
+    Half of the problems (on average) are one-step, ax + b = c, with a drawn
+    from 1, 1, 1, 2, -1, -2; the rest are two-step, ax + b = cx + d, with a
+    and c in -3..3 (never 0, never equal). b, c and d use the difficulty's
+    range, as in algebra_game. The same seed always gives the same
+    problems. Returns a dict of equal-length columns: 'two_step', 'a',
+    'b', 'c', 'd' and 'solution' as arrays, 'equation' as a list of strings.
+    """
+    with timed('mathgame.algebra.generate'):
+        rng = np.random.default_rng(seed)
+        max_num = ALGEBRA_MAX_NUM.get(difficulty, ALGEBRA_MAX_NUM['hard'])
+
+        two_step = rng.integers(0, 2, n).astype(bool)
+        b = rng.integers(-max_num, max_num + 1, n)
+        d = rng.integers(-max_num, max_num + 1, n)
+
+        one_step_a = rng.choice(np.array([1, 1, 1, 2, -1, -2]), n)  # more chance for simple problems
+        one_step_c = rng.integers(-max_num, max_num + 1, n)
+        two_step_a = rng.integers(-3, 4, n)
+        two_step_a[two_step_a == 0] = 1
+        two_step_c = rng.integers(-3, 4, n)
+        two_step_c[two_step_c == 0] = 1
+        same = two_step_c == two_step_a  # a - c would be zero, leaving no single solution
+        two_step_c[same] = -two_step_a[same]
+
+        a = np.where(two_step, two_step_a, one_step_a)
+        c = np.where(two_step, two_step_c, one_step_c)
+        d = np.where(two_step, d, 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            solution = np.where(two_step, (d - b) / (a - c), (c - b) / a)
+
+        equation = [format_algebra_equation(*row)
+                    for row in zip(two_step.tolist(), a.tolist(), b.tolist(), c.tolist(), d.tolist())]
+    count('mathgame.problems_generated', n)
+    return {'two_step': two_step, 'a': a, 'b': b, 'c': c, 'd': d, 'solution': solution, 'equation': equation}
+
+def _problem_rows(problems, first_id, difficulty):
+    for offset, (two_step, a, b, c, d, solution, equation) in enumerate(zip(
+            problems['two_step'].tolist(), problems['a'].tolist(), problems['b'].tolist(),
+            problems['c'].tolist(), problems['d'].tolist(), problems['solution'].tolist(),
+            problems['equation'])):
+        yield {
+            'id': first_id + offset,
+            'difficulty': difficulty,
+            'type': 'two-step' if two_step else 'one-step',
+            'equation': equation,
+            'solution': solution,
+            'a': a, 'b': b, 'c': c, 'd': d,
+        }
+
+def _generate_chunk(args):
+    first_id, size, difficulty, seed = args
+    return list(_problem_rows(generate_algebra_problems(size, difficulty, seed), first_id, difficulty))
+
+def write_algebra_problems(path, n, difficulty='easy', seed=None, chunk_size=100000, workers=1):
+    """Streams n problems to a .jsonl or .csv file, chunk_size at a time.
+
+    Each chunk draws from its own child of the seed, so a seeded bank is
+    identical however many workers build it. With workers > 1 chunks are
+    generated in a process pool, at most two per worker in flight.
+    """
+    if not path.lower().endswith(('.jsonl', '.csv')):
+        raise ValueError("Unsupported output format. Use a .jsonl or .csv path.")
+    chunk_seeds = np.random.SeedSequence(seed).spawn(-(-n // chunk_size))
+    jobs = ((start, min(chunk_size, n - start), difficulty, chunk_seed)
+            for start, chunk_seed in zip(range(0, n, chunk_size), chunk_seeds))
+
+    with open(path, 'w', newline='') as handle:
+        if path.lower().endswith('.csv'):
+            writer = csv.DictWriter(handle, fieldnames=['id', 'difficulty', 'type', 'equation', 'solution', 'a', 'b', 'c', 'd'])
+            writer.writeheader()
+            for rows in ordered_map(_generate_chunk, jobs, workers):
+                writer.writerows(rows)
+        else:
+            for rows in ordered_map(_generate_chunk, jobs, workers):
+                handle.writelines(json.dumps(row) + "\n" for row in rows)
+
 def algebra_game():
     print("\nAlgebra Practice Game")
     print("Solve the one-step and two-step equations.")
 
     # Difficulty selection
     difficulty = input("Choose difficulty (easy/medium/hard): ").lower()
-    if difficulty == "easy":
-        max_num = 10
-    elif difficulty == "medium":
-        max_num = 20
-    else:  # hard
-        max_num = 50
 
     score = 0
     num_problems = 5
+    problems = generate_algebra_problems(num_problems, difficulty)
 
-    for _ in range(num_problems):
-        # Randomly choose between one-step and two-step problems
-        problem_type = random.choice(['one-step', 'two-step'])
-
-        if problem_type == 'one-step':
-            # ax + b = c
-            a = random.choice([1, 1, 1, 2, -1, -2])  # more chance for simple problems
-            b = random.randint(-max_num, max_num)
-            c = random.randint(-max_num, max_num)
-
-            # Calculate correct answer
-            x = (c - b) / a
-
-            # Format equation
-            if a == 1:
-                eq = f"x + {b} = {c}"
-            elif a == -1:
-                eq = f"-x + {b} = {c}"
-            else:
-                eq = f"{a}x + {b} = {c}"
-
-            print(f"\nSolve for x: {eq}")
-
-        else:  # two-step
-            # ax + b = cx + d
-            a = random.randint(-3, 3)
-            if a == 0:
-                a = 1
-            c = random.randint(-3, 3)
-            if c == 0:
-                c = 1
-            b = random.randint(-max_num, max_num)
-            d = random.randint(-max_num, max_num)
-
-            # Calculate correct answer
-            x = (d - b) / (a - c)
-
-            # Format equation
-            def term(coeff, var):
-                if coeff == 1:
-                    return var
-                elif coeff == -1:
-                    return f"-{var}"
-                else:
-                    return f"{coeff}{var}"
-
-            left = f"{term(a, 'x')} + {b}" if b >= 0 else f"{term(a, 'x')} - {-b}"
-            right = f"{term(c, 'x')} + {d}" if d >= 0 else f"{term(c, 'x')} - {-d}"
-            eq = f"{left} = {right}"
-
-            print(f"\nSolve for x: {eq}")
+    for eq, x in zip(problems['equation'], problems['solution']):
+        print(f"\nSolve for x: {eq}")
 
         # Get user answer
         while True:
@@ -136,7 +422,67 @@ def algebra_game():
 
     print(f"\nGame over! Your score: {score}/{num_problems}")
 
-def projectile_game():
+class BlittedParabola:
+    """Keeps a parabola line on screen by redrawing only it and the slider axes.
+
+    The x² and x columns are computed once and y = ax² + bx + c is
+    evaluated into preallocated buffers. The rest of the figure (wall, grid,
+    ticks) is captured after each full draw and restored instead of being
+    redrawn; backends that cannot blit fall back to draw_idle. on_frame, if
+    given, is called with the seconds each update took.
+    """
+
+    def __init__(self, line, x, redraw_axes=(), on_frame=None):
+        self.line = line
+        self.x = x
+        self.x_squared = x * x
+        self.y = np.empty_like(x)
+        self.scratch = np.empty_like(x)
+        self.redraw_axes = list(redraw_axes)  # e.g. slider axes, which change with every update
+        self.on_frame = on_frame
+        self.fig = line.figure
+        self.background = None
+        # Animated artists are left out of full draws, and so out of the background.
+        line.set_animated(True)
+        for ax in self.redraw_axes:
+            ax.set_animated(True)
+        self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _on_draw(self, event):
+        canvas = self.fig.canvas
+        self.background = canvas.copy_from_bbox(self.fig.bbox) if canvas.supports_blit else None
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for ax in self.redraw_axes:
+            self.fig.draw_artist(ax)
+        self.line.axes.draw_artist(self.line)
+
+    def evaluate(self, a, b, c):
+        """Returns ax² + bx + c over x, in a buffer that the next call overwrites."""
+        np.multiply(self.x_squared, a, out=self.y)
+        np.multiply(self.x, b, out=self.scratch)
+        self.y += self.scratch
+        self.y += c
+        return self.y
+
+    def update(self, a, b, c):
+        start = time.perf_counter()
+        with timed('mathgame.projectile.update'):
+            self.line.set_ydata(self.evaluate(a, b, c))
+            canvas = self.fig.canvas
+            if self.background is None:
+                canvas.draw_idle()
+            else:
+                canvas.restore_region(self.background)
+                self._draw_animated()
+                canvas.blit(self.fig.bbox)
+                canvas.flush_events()
+        if self.on_frame is not None:
+            self.on_frame(time.perf_counter() - start)
+
+def projectile_game(on_frame=None):
+    """on_frame, if given, is called with the seconds each easy-mode slider update takes."""
     print("\nProjectile Game")
     print("Adjust the parabola to clear the wall.")
 
@@ -144,23 +490,15 @@ def projectile_game():
     difficulty = input("Choose difficulty (easy/hard): ").lower()
 
     # Wall parameters
-    wall_x = random.uniform(3, 7)
-    wall_height = random.uniform(1, 4)
-    wall_width = 0.2
+    wall_x, wall_height = new_wall()
+    wall_width = WALL_WIDTH
 
     # Set up the figure
     fig, ax = plt.subplots()
     plt.subplots_adjust(bottom=0.4)  # make room for sliders
 
     # Initial parabola parameters
-    if difficulty == "easy":
-        init_a = -0.5
-        init_b = 3
-        init_c = 0
-    else:
-        init_a = -1
-        init_b = 5
-        init_c = 0
+    init_a, init_b, init_c = PROJECTILE_START.get(difficulty, PROJECTILE_START['hard'])
 
     # Create the parabola
     x = np.linspace(0, 10, 500)
@@ -188,15 +526,14 @@ def projectile_game():
         slider_a = Slider(ax_a, 'a', -2.0, 0.0, valinit=init_a)
         slider_b = Slider(ax_b, 'b', 0.0, 10.0, valinit=init_b)
         slider_c = Slider(ax_c, 'c', -5.0, 5.0, valinit=init_c)
+        # The sliders are redrawn by the parabola's blitting, not by full redraws
+        for slider in (slider_a, slider_b, slider_c):
+            slider.drawon = False
+        parabola = BlittedParabola(line, x, redraw_axes=[ax_a, ax_b, ax_c], on_frame=on_frame)
 
         # Update function for sliders
         def update(val):
-            a = slider_a.val
-            b = slider_b.val
-            c = slider_c.val
-            y = a * x**2 + b * x + c
-            line.set_ydata(y)
-            fig.canvas.draw_idle()
+            parabola.update(slider_a.val, slider_b.val, slider_c.val)
 
         slider_a.on_changed(update)
         slider_b.on_changed(update)
@@ -212,8 +549,7 @@ def projectile_game():
             c = slider_c.val
 
             # Check if parabola clears the wall
-            y_at_wall = a * wall_x**2 + b * wall_x + c
-            if y_at_wall > wall_height:
+            if clears_wall(a, b, c, wall_x, wall_height):
                 print("\nSuccess! You cleared the wall!")
             else:
                 print("\nTry again! The parabola didn't clear the wall.")
@@ -238,8 +574,7 @@ def projectile_game():
                 print("Please enter numbers only.")
 
         # Check if parabola clears the wall
-        y_at_wall = a * wall_x**2 + b * wall_x + c
-        if y_at_wall > wall_height:
+        if clears_wall(a, b, c, wall_x, wall_height):
             print("\nSuccess! You cleared the wall!")
         else:
             print("\nTry again! The parabola didn't clear the wall.")
@@ -0,0 +1,433 @@
+"""Headless session server for the math games.
+
+The games in MathGame talk to one player through input() and plt.show().
+Here the same game logic runs as sessions driven by messages, so a single
+process can serve many players at once. Sessions are small __slots__
+objects; boards are rendered to PNG with Agg only when a client asks for
+images, in a process pool so rendering does not stall the event loop.
+Scatter boards come from a fixed set of seeds, so each render worker keeps
+recent boards in memory and can serve boards pre-rendered to disk.
+
+The wire protocol is one JSON object per line over TCP:
+
+    {"op": "start", "game": "scatter", "difficulty": "easy", "images": true}
+    {"op": "answer", "session": 1, "answer": "3,-2"}
+    {"op": "end", "session": 1}
+
+Every request gets one JSON line back; failures are {"error": "..."}.
+"""
+import matplotlib
+matplotlib.use('Agg')
+
+import argparse
+import asyncio
+import base64
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Instrumentation import count, timed
+from MathGame import (
+    PROJECTILE_START,
+    SCATTER_SIZES,
+    clears_wall,
+    configure_scatter_boards,
+    generate_algebra_problems,
+    new_wall,
+    parse_point,
+    prerender_scatter_boards,
+    render_projectile_png,
+    render_scatter_board,
+    scatter_board,
+)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+IDLE_TIMEOUT = 600  # seconds without a message before a session is dropped
+ALGEBRA_PROBLEMS = 5
+# Scatter boards are drawn from this many seeds per difficulty, so a pool of
+# pre-rendered boards (see the prerender command) can cover every game.
+SCATTER_SEEDS = 4096
+
+class ScatterSession:
+    """Identify the coordinates of each point, in order; a wrong answer keeps the same point."""
+    __slots__ = ('difficulty', 'seed', 'x_coords', 'y_coords', 'index', 'score', 'last_seen')
+
+    def __init__(self, difficulty, rng):
+        # Boards are drawn from a seed so their PNGs can be cached and pre-rendered.
+        self.difficulty = difficulty
+        self.seed = rng.randrange(SCATTER_SEEDS)
+        _, x_coords, y_coords = scatter_board(difficulty, self.seed)
+        self.x_coords = tuple(x_coords)
+        self.y_coords = tuple(y_coords)
+        self.index = 0
+        self.score = 0
+
+    def prompt(self):
+        return f"Enter coordinates for point {self.index+1} as x,y: "
+
+    def render(self):
+        return render_scatter_board, (self.difficulty, self.seed)
+
+    def answer(self, answer):
+        try:
+            point = parse_point(answer)
+        except ValueError:
+            return {'message': "Invalid format. Please enter as x,y (e.g., 3,-2)"}
+        if point != (self.x_coords[self.index], self.y_coords[self.index]):
+            return {'correct': False, 'message': "Incorrect. Try again."}
+        self.score += 1
+        self.index += 1
+        return {'correct': True, 'message': "Correct!"}
+
+    @property
+    def done(self):
+        return self.index == len(self.x_coords)
+
+    @property
+    def total(self):
+        return len(self.x_coords)
+
+class AlgebraSession:
+    """Solve each equation for x; every numeric answer moves on to the next one."""
+    __slots__ = ('equations', 'solutions', 'index', 'score', 'last_seen')
+
+    def __init__(self, difficulty, rng):
+        problems = generate_algebra_problems(ALGEBRA_PROBLEMS, difficulty, seed=rng.getrandbits(64))
+        self.equations = tuple(problems['equation'])
+        self.solutions = tuple(problems['solution'].tolist())
+        self.index = 0
+        self.score = 0
+
+    def prompt(self):
+        return f"Solve for x: {self.equations[self.index]}"
+
+    def render(self):
+        return None
+
+    def answer(self, answer):
+        try:
+            value = float(answer)
+        except ValueError:
+            return {'message': "Please enter a number."}
+        correct = abs(value - self.solutions[self.index]) < 0.001
+        self.score += correct
+        self.index += 1
+        return {'correct': correct, 'message': "Correct!" if correct else "Incorrect. Try again."}
+
+    @property
+    def done(self):
+        return self.index == len(self.equations)
+
+    @property
+    def total(self):
+        return len(self.equations)
+
+class ProjectileSession:
+    """Choose a, b and c so y = ax² + bx + c clears the wall; one attempt per game."""
+    __slots__ = ('difficulty', 'wall_x', 'wall_height', 'attempt', 'score', 'last_seen')
+
+    def __init__(self, difficulty, rng):
+        self.difficulty = difficulty
+        self.wall_x, self.wall_height = new_wall(rng)
+        self.attempt = None
+        self.score = 0
+
+    def prompt(self):
+        return "Enter the coefficients for the parabola (y = ax² + bx + c) as a,b,c: "
+
+    def render(self):
+        if self.attempt is None:
+            a, b, c = PROJECTILE_START.get(self.difficulty, PROJECTILE_START['hard'])
+            return render_projectile_png, (self.wall_x, self.wall_height, a, b, c)
+        return render_projectile_png, (self.wall_x, self.wall_height, *self.attempt, True)
+
+    def answer(self, answer):
+        try:
+            a, b, c = map(float, answer.split(','))
+        except ValueError:
+            return {'message': "Please enter numbers only."}
+        self.attempt = (a, b, c)
+        if clears_wall(a, b, c, self.wall_x, self.wall_height):
+            self.score = 1
+            return {'correct': True, 'message': "Success! You cleared the wall!"}
+        return {'correct': False, 'message': "Try again! The parabola didn't clear the wall."}
+
+    @property
+    def done(self):
+        return self.attempt is not None
+
+    @property
+    def total(self):
+        return 1
+
+GAMES = {
+    'scatter': ScatterSession,
+    'algebra': AlgebraSession,
+    'projectile': ProjectileSession,
+}
+
+class SessionEngine:
+    """Game sessions keyed by id, driven one message at a time.
+
+    handle() does no I/O: it returns the response and, when the client asked
+    for images, a (render_function, args) pair whose PNG belongs in the
+    response's 'image' field. The transport decides where that render runs.
+    """
+
+    def __init__(self, idle_timeout=IDLE_TIMEOUT, seed=None):
+        self.idle_timeout = idle_timeout
+        self.rng = random.Random(seed)
+        self.sessions = {}
+        self.images = set()  # ids of sessions whose client wants rendered boards
+        self._ids = itertools.count(1)
+
+    def handle(self, message):
+        op = message.get('op')
+        if op == 'start':
+            return self._start(message)
+        if op not in ('answer', 'end'):
+            return {'error': f"Unknown op: {op!r}"}, None
+        session_id = message.get('session')
+        # Ids are ints; checking first also keeps unhashable values out of the lookup.
+        session = self.sessions.get(session_id) if type(session_id) is int else None
+        if session is None:
+            return {'error': f"Unknown session: {session_id!r}"}, None
+        session.last_seen = time.monotonic()
+        if op == 'end':
+            self._drop(session_id)
+            return {'session': session_id, 'score': session.score, 'total': session.total}, None
+        return self._answer(session_id, session, message)
+
+    def _start(self, message):
+        game_name = message.get('game')
+        game = GAMES.get(game_name) if isinstance(game_name, str) else None
+        if game is None:
+            return {'error': f"Unknown game: {game_name!r}"}, None
+        session = game(str(message.get('difficulty', 'easy')).lower(), self.rng)
+        session.last_seen = time.monotonic()
+        session_id = next(self._ids)
+        self.sessions[session_id] = session
+        count('mathgame.sessions_started')
+        response = {'session': session_id, 'prompt': session.prompt()}
+        render = None
+        if message.get('images'):
+            self.images.add(session_id)
+            render = session.render()
+        return response, render
+
+    def _answer(self, session_id, session, message):
+        response = session.answer(str(message.get('answer', '')))
+        response['session'] = session_id
+        response['score'] = session.score
+        render = session.render() if session_id in self.images and session.done else None
+        if session.done:
+            response['done'] = True
+            response['message'] += f"\nGame over! Your score: {session.score}/{session.total}"
+            self._drop(session_id)
+        else:
+            response['prompt'] = session.prompt()
+        return response, render
+
+    def _drop(self, session_id):
+        del self.sessions[session_id]
+        self.images.discard(session_id)
+
+    def expire(self, now=None):
+        """Drops sessions idle for longer than idle_timeout and returns how many went."""
+        cutoff = (time.monotonic() if now is None else now) - self.idle_timeout
+        stale = [session_id for session_id, session in self.sessions.items() if session.last_seen < cutoff]
+        for session_id in stale:
+            self._drop(session_id)
+        return len(stale)
+
+class GameServer:
+    """Serves a SessionEngine over TCP, one JSON message per line."""
+
+    def __init__(self, engine=None, render_workers=None, board_dir=None):
+        self.engine = engine or SessionEngine()
+        self.render_workers = render_workers
+        self.board_dir = board_dir  # pre-rendered scatter boards, if any
+        self._executor = None
+
+    async def _respond(self, message):
+        try:
+            with timed('mathgame.server.handle'):
+                response, render = self.engine.handle(message)
+            if render is not None:
+                function, args = render
+                if self._executor is None:
+                    png = function(*args)
+                else:
+                    loop = asyncio.get_running_loop()
+                    png = await loop.run_in_executor(self._executor, function, *args)
+                response['image'] = base64.b64encode(png).decode('ascii')
+        except Exception as e:
+            # Keep the one-reply-per-request promise even when a handler fails.
+            count('mathgame.server.errors')
+            return {'error': f"Could not handle request: {e}"}
+        return response
+
+    async def _serve_client(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                    if not isinstance(message, dict):
+                        raise ValueError("expected a JSON object")
+                except ValueError as e:
+                    response = {'error': f"Invalid message: {e}"}
+                else:
+                    response = await self._respond(message)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _expire_idle(self):
+        while True:
+            await asyncio.sleep(max(self.engine.idle_timeout / 4, 1))
+            self.engine.expire()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+        """Serves until cancelled; ready, if given, is called with the bound port."""
+        if self.render_workers != 0:
+            self._executor = ProcessPoolExecutor(max_workers=self.render_workers, initializer=configure_scatter_boards,
+                                                 initargs=(self.board_dir,))
+        else:
+            configure_scatter_boards(self.board_dir)
+        server = await asyncio.start_server(self._serve_client, host, port, limit=1024 * 1024)
+        expiry = asyncio.create_task(self._expire_idle())
+        try:
+            if ready is not None:
+                ready(server.sockets[0].getsockname()[1])
+            async with server:
+                await server.serve_forever()
+        finally:
+            expiry.cancel()
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+_LOAD_TEST_ANSWERS = {
+    'scatter': lambda rng: f"{rng.randint(-10, 10)},{rng.randint(-10, 10)}",
+    'algebra': lambda rng: str(rng.randint(-10, 10)),
+    'projectile': lambda rng: f"{rng.uniform(-2, 0):.2f},{rng.uniform(0, 10):.2f},0",
+}
+
+async def _scripted_player(host, port, games, answers, images, rng, latencies):
+    reader, writer = await asyncio.open_connection(host, port, limit=1024 * 1024)
+
+    async def request(message):
+        start = time.perf_counter()
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return response
+
+    try:
+        for game in games:
+            session = (await request({'op': 'start', 'game': game, 'difficulty': 'easy', 'images': images}))['session']
+            for _ in range(answers):
+                response = await request({'op': 'answer', 'session': session, 'answer': _LOAD_TEST_ANSWERS[game](rng)})
+                if response.get('done'):
+                    break
+            else:
+                await request({'op': 'end', 'session': session})
+    finally:
+        writer.close()
+
+async def load_test(host=DEFAULT_HOST, port=DEFAULT_PORT, clients=1000, games=3, answers=5, images=False, seed=None):
+    """Plays games with clients concurrent scripted players and returns latency statistics.
+
+    Each player opens one connection and plays games sessions in turn,
+    cycling through the three games, with up to answers random answers each;
+    scatter sessions still open after that are ended explicitly.
+    """
+    rng = random.Random(seed)
+    names = list(GAMES)
+    latencies = []
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        _scripted_player(host, port, [names[(i + g) % len(names)] for g in range(games)], answers, images,
+                         random.Random(rng.getrandbits(64)), latencies)
+        for i in range(clients)
+    ), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    failures = [result for result in results if isinstance(result, Exception)]
+    latency = np.array(latencies) * 1000
+    p50, p95, p99 = np.percentile(latency, [50, 95, 99]) if latency.size else (float('nan'),) * 3
+    return {
+        'clients': clients,
+        'failed_clients': len(failures),
+        'first_failure': repr(failures[0]) if failures else None,
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed,
+        'latency_ms': {'p50': p50, 'p95': p95, 'p99': p99, 'max': float(latency.max()) if latency.size else float('nan')},
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the math games as a headless server, or load-test one.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser('serve', help="serve game sessions over TCP")
+    serve.add_argument('--host', default=DEFAULT_HOST)
+    serve.add_argument('--port', type=int, default=DEFAULT_PORT)
+    serve.add_argument('--idle-timeout', type=float, default=IDLE_TIMEOUT,
+                       help="seconds before an idle session is dropped")
+    serve.add_argument('--render-workers', type=int, default=None,
+                       help="processes for rendering boards (default: one per CPU; 0 renders in the server)")
+    serve.add_argument('--board-dir', default=None, help="directory of boards written by the prerender command")
+    serve.add_argument('--seed', type=int, default=None)
+
+    prerender = commands.add_parser('prerender', help="write the scatter boards the server can draw ahead of time")
+    prerender.add_argument('board_dir')
+    prerender.add_argument('--difficulty', nargs='+', default=list(SCATTER_SIZES), choices=list(SCATTER_SIZES))
+    prerender.add_argument('--boards', type=int, default=SCATTER_SEEDS, help="boards per difficulty")
+    prerender.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+
+    test = commands.add_parser('load-test', help="play scripted sessions against a running server")
+    test.add_argument('--host', default=DEFAULT_HOST)
+    test.add_argument('--port', type=int, default=DEFAULT_PORT)
+    test.add_argument('--clients', type=int, default=1000)
+    test.add_argument('--games', type=int, default=3, help="sessions played by each client")
+    test.add_argument('--answers', type=int, default=5, help="most answers sent per session")
+    test.add_argument('--images', action='store_true', help="ask for rendered boards")
+    test.add_argument('--seed', type=int, default=None)
+
+    args = parser.parse_args(argv)
+    if args.command == 'serve':
+        server = GameServer(SessionEngine(args.idle_timeout, args.seed), args.render_workers, args.board_dir)
+        try:
+            asyncio.run(server.serve(args.host, args.port,
+                                     ready=lambda port: print(f"Serving math games on {args.host}:{port}")))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    if args.command == 'prerender':
+        for difficulty in args.difficulty:
+            written = prerender_scatter_boards(args.board_dir, difficulty, range(min(args.boards, SCATTER_SEEDS)),
+                                               args.workers)
+            print(f"{difficulty}: {written} boards")
+        return 0
+
+    report = asyncio.run(load_test(args.host, args.port, args.clients, args.games, args.answers,
+                                   args.images, args.seed))
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 1 if report['failed_clients'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
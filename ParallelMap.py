@@ -0,0 +1,24 @@
+"""Bounded, order-preserving process-pool map shared by the batch writers and simulations."""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+def ordered_map(function, jobs, workers=1):
+    """Yields function(job) for every job, in input order.
+
+    With workers > 1 the jobs run in a pool of that many processes, with at
+    most two jobs per worker in flight, so jobs can be a lazy iterable of any
+    length and memory stays bounded. With workers <= 1 they run in this
+    process. function must be picklable (defined at module level).
+    """
+    if workers <= 1:
+        for job in jobs:
+            yield function(job)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for job in jobs:
+            pending.append(pool.submit(function, job))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
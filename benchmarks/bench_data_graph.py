@@ -0,0 +1,75 @@
+"""Benchmarks for DataGraphExplorer loading and rendering on locally generated data."""
+import functools
+import http.server
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from DataGraphExplorer import DataGraphExplorer
+
+SIZES = [10**3, 10**4, 10**5, 10**6, 10**7]
+
+_data_dir = tempfile.mkdtemp(prefix='bench-data-')
+
+def _frame(n):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'x': np.arange(n, dtype=float),
+        'y': np.cumsum(rng.standard_normal(n)),
+        'z': rng.standard_normal(n),
+        'w': rng.uniform(0, 100, n),
+    })
+
+def _csv_path(n):
+    """Writes the n-row dataset once per run and returns its path."""
+    path = os.path.join(_data_dir, f'data_{n}.csv')
+    if not os.path.exists(path):
+        _frame(n).to_csv(path, index=False)
+    return path
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+class CsvLoad:
+    params = SIZES
+
+    def setup(self, n):
+        self.path = _csv_path(n)
+        handler = functools.partial(_QuietHandler, directory=_data_dir)
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/{os.path.basename(self.path)}"
+        self.explorer = DataGraphExplorer()
+
+    def teardown(self, n):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def time_read_csv_local(self, n):
+        self.explorer._read_csv(self.path)
+
+    def time_read_csv_http(self, n):
+        self.explorer._read_csv(self.url)
+
+    def time_read_csv_two_columns(self, n):
+        self.explorer._read_csv(self.path, usecols=['x', 'y'])
+
+class PlotRender:
+    params = SIZES
+
+    def setup(self, n):
+        self.explorer = DataGraphExplorer()
+        self.explorer.df = _frame(n)
+
+    def time_histogram(self, n):
+        self.explorer.plot('z')
+
+    def time_scatter(self, n):
+        self.explorer.plot('z', 'w', 'scatter')
+
+    def time_line(self, n):
+        self.explorer.plot('x', 'y', 'line')
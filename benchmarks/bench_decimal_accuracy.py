@@ -0,0 +1,80 @@
+"""Compares the float and decimal backends of the financial formulas for speed and accuracy.
+
+Random long-horizon cases (large principals, rates with up to three
+decimals, 30 to 40 year terms) are evaluated with the public scalar
+functions (calculate_annuity and friends) under backend='float' and
+backend='decimal', and with the batched float formulas. The decimal
+results, rounded half to even, are the reference: the report gives the
+time per case of each path, how often each float path lands on a
+different cent, and the largest error of the unrounded batched floats.
+Run from the repository root: python benchmarks/bench_decimal_accuracy.py [cases]
+"""
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import FinancialCore
+import FinancialDecimal
+
+def _cases(n, seed=0):
+    rng = random.Random(seed)
+    rate = lambda: round(rng.uniform(0.5, 12), rng.choice([1, 2, 3]))
+    amount = lambda: round(rng.uniform(1e4, 5e7), 2)
+    return {
+        'annuity': [(amount(), rate(), rng.randint(30, 40), 'monthly', round(rng.uniform(0, 5000), 2))
+                    for _ in range(n)],
+        'mortgage': [(amount(), rate(), rng.randint(30, 40)) for _ in range(n)],
+        'retirement': [(age := rng.randint(20, 35), age + rng.randint(30, 40), amount(), round(rng.uniform(0, 60000), 2),
+                        rate()) for _ in range(n)],
+    }
+
+# Per formula: the public scalar function, its batched float version and the
+# unrounded decimal formula (used only for the error before rounding).
+FORMULAS = {
+    'annuity': (FinancialCore.calculate_annuity, FinancialCore.calculate_annuity_batch,
+                FinancialDecimal.annuity_value),
+    'mortgage': (FinancialCore.calculate_mortgage_payment, FinancialCore.calculate_mortgage_payment_batch,
+                 FinancialDecimal.mortgage_payment),
+    'retirement': (FinancialCore.estimate_retirement_balance, FinancialCore.estimate_retirement_balance_batch,
+                   FinancialDecimal.retirement_balance),
+}
+
+def _per_case(function, cases, **kwargs):
+    start = time.perf_counter()
+    results = [function(*case, **kwargs) for case in cases]
+    return results, (time.perf_counter() - start) / len(cases)
+
+def _amount(message):
+    """The dollar amount in a scalar function's result, e.g. 'Monthly mortgage payment: $1264.14'."""
+    return Decimal(message.split('$', 1)[1].split()[0])
+
+def main(n=20000):
+    print(f"{n} cases per formula; times are per case, errors are against the decimal backend")
+    print(f"{'formula':>10} {'float':>10} {'batched':>10} {'decimal':>10} "
+          f"{'float off':>10} {'batch off':>10} {'max error':>12}")
+    for name, cases in _cases(n).items():
+        scalar_function, batch_function, exact_function = FORMULAS[name]
+        floats, float_time = _per_case(scalar_function, cases, backend='float')
+        decimals, decimal_time = _per_case(scalar_function, cases, backend='decimal')
+        cents = [_amount(message) for message in decimals]
+
+        columns = [np.array(column) if not isinstance(column[0], str) else column[0] for column in zip(*cases)]
+        start = time.perf_counter()
+        batched, _ = batch_function(*columns)
+        batch_time = (time.perf_counter() - start) / n
+
+        float_off = sum(_amount(message) != reference for message, reference in zip(floats, cents))
+        batch_off = sum(Decimal(f"{value:.2f}") != reference for value, reference in zip(batched.tolist(), cents))
+        exact = [exact_function(*case) for case in cases]
+        worst = max(abs(Decimal(value) - reference) for value, reference in zip(batched.tolist(), exact))
+        print(f"{name:>10} {float_time * 1e6:8.1f}us {batch_time * 1e6:8.3f}us {decimal_time * 1e6:8.1f}us "
+              f"{float_off / n:10.3%} {batch_off / n:10.3%} {float(worst):12.2e}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
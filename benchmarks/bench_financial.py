@@ -0,0 +1,98 @@
+"""Benchmarks for the FinancialCore formulas, scalar and batched, the scenario engine and the inverse solvers."""
+import numpy as np
+
+import FinancialCore
+import FinancialScenarios
+import FinancialSolvers
+
+class ScalarFormulas:
+    def time_annuity(self):
+        FinancialCore.calculate_annuity(10000, 5, 30, 'monthly', 200)
+
+    def time_mortgage_payment(self):
+        FinancialCore.calculate_mortgage_payment(250000, 6.5, 30)
+
+    def time_retirement_balance(self):
+        FinancialCore.estimate_retirement_balance(30, 65, 20000, 6000, 7)
+
+    def time_time_to_double(self):
+        FinancialCore.time_to_double(1000, 7, 'annually')
+
+class CachedScalarFormulas(ScalarFormulas):
+    # The same calls with the factor cache on, so every call after the first is a hit.
+    def setup(self):
+        FinancialCore.enable_cache()
+
+    def teardown(self):
+        FinancialCore.disable_cache()
+
+class DecimalBackend:
+    def time_annuity(self):
+        FinancialCore.calculate_annuity(10000, 5, 30, 'monthly', 200, backend='decimal')
+
+    def time_mortgage_payment(self):
+        FinancialCore.calculate_mortgage_payment(250000, 6.5, 30, backend='decimal')
+
+    def time_retirement_balance(self):
+        FinancialCore.estimate_retirement_balance(30, 65, 20000, 6000, 7, backend='decimal')
+
+class BatchFormulas:
+    params = [10**3, 10**4, 10**5, 10**6]
+
+    def setup(self, n):
+        rng = np.random.default_rng(0)
+        self.principal = rng.uniform(1e4, 1e6, n)
+        self.rate = rng.uniform(0, 12, n)
+        self.time = rng.choice([10, 15, 20, 30], n)
+        self.current_age = rng.integers(20, 60, n)
+
+    def time_annuity_batch(self, n):
+        FinancialCore.calculate_annuity_batch(self.principal, self.rate, self.time, 'monthly', 100)
+
+    def time_mortgage_payment_batch(self, n):
+        FinancialCore.calculate_mortgage_payment_batch(self.principal, self.rate, self.time)
+
+    def time_retirement_balance_batch(self, n):
+        FinancialCore.estimate_retirement_balance_batch(self.current_age, 67, self.principal, 6000, self.rate)
+
+class AmortizationTable:
+    params = [10, 100, 1000]  # loans of 30 years, 360 rows each
+
+    def setup(self, n):
+        self.principal = np.full(n, 250000.0)
+        self.rate = np.linspace(2, 9, n)
+
+    def time_amortization_table(self, n):
+        FinancialCore.amortization_table(self.principal, self.rate, 30)
+
+class Scenarios:
+    params = [10**4, 10**5, 10**6]  # Monte Carlo paths over 35 years
+
+    def time_simulate_retirement(self, n):
+        FinancialScenarios.simulate_retirement(30, 65, 10000, 6000, 6, 15, n_paths=n, seed=0, workers=1)
+
+    def time_sensitivity_grid(self, n):
+        FinancialScenarios.sensitivity_grid(
+            FinancialCore.estimate_retirement_balance_batch,
+            {'annual_growth_rate': np.linspace(0, 12, n // 100), 'annual_contribution': np.linspace(0, 20000, 100)},
+            current_age=30, retirement_age=65, current_savings=10000)
+
+class InverseSolvers:
+    params = [10**3, 10**4, 10**5, 10**6]
+
+    def setup(self, n):
+        rng = np.random.default_rng(0)
+        self.principal = rng.uniform(1e4, 1e6, n)
+        self.time = rng.choice([10, 15, 20, 30], n)
+        rate = rng.uniform(0, 12, n)
+        self.payment, _ = FinancialCore.calculate_mortgage_payment_batch(self.principal, rate, self.time)
+        self.balance, _ = FinancialCore.estimate_retirement_balance_batch(30, 67, self.principal, 6000, rate)
+
+    def time_solve_mortgage_rate(self, n):
+        FinancialSolvers.solve_mortgage_rate_batch(self.principal, self.time, self.payment)
+
+    def time_solve_retirement_rate(self, n):
+        FinancialSolvers.solve_retirement_rate_batch(30, 67, self.principal, 6000, self.balance)
+
+    def time_solve_mortgage_term(self, n):
+        FinancialSolvers.solve_mortgage_term_batch(self.principal, 6, self.payment)
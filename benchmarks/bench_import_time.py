@@ -0,0 +1,46 @@
+"""Measures cold-start import time of the financial calculator modules.
+
+Each statement runs in a fresh interpreter, so the numbers include
+everything a worker process or short CLI invocation pays at startup.
+Run from the repository root: python benchmarks/bench_import_time.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STATEMENTS = {
+    'interpreter only': 'pass',
+    'old top-level imports': 'import math, numpy, matplotlib.pyplot, ipywidgets, IPython.display',
+    'old imports minus Jupyter': 'import math, numpy, matplotlib.pyplot',
+    'FinancialCore': 'import FinancialCore',
+    'FinancialCalculator': 'import FinancialCalculator',
+}
+
+def time_statement(statement, repeat):
+    """Returns the median wall time of running statement in a new interpreter, or None if it fails."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, '-c', statement], cwd=REPO_ROOT,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        elapsed = time.perf_counter() - start
+        if completed.returncode != 0:
+            return None
+        timings.append(elapsed)
+    return statistics.median(timings)
+
+def main(repeat=10):
+    print(f"Median cold-start time over {repeat} runs")
+    for label, statement in STATEMENTS.items():
+        median = time_statement(statement, repeat)
+        if median is None:
+            print(f"{label:>24}: unavailable (import failed)")
+        else:
+            print(f"{label:>24}: {median * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,62 @@
+"""Benchmarks for MathGame problem generation and grading, driven with scripted answers."""
+import builtins
+import contextlib
+import io
+
+import numpy as np
+
+import MathGame
+
+@contextlib.contextmanager
+def _scripted(answers):
+    """Feeds answers to input() and discards printed output."""
+    replies = iter(answers)
+    original = builtins.input
+    builtins.input = lambda prompt='': next(replies)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        builtins.input = original
+
+class AlgebraGame:
+    params = ['easy', 'hard']
+
+    def time_five_problem_round(self, difficulty):
+        with _scripted([difficulty] + ['0'] * 5):
+            MathGame.algebra_game()
+
+class AlgebraProblemBank:
+    params = [10**3, 10**4, 10**5, 10**6]
+
+    def time_generate(self, n):
+        MathGame.generate_algebra_problems(n, 'hard', seed=0)
+
+class WallGrading:
+    """Grading projectile attempts one clears_wall call at a time versus one grade_attempts call.
+
+    time_center_only is the check clears_wall replaced, the parabola's height
+    at the wall's center only, as the baseline for the per-attempt cost.
+    """
+    params = [10**3, 10**4, 10**5]
+
+    def setup(self, n):
+        rng = np.random.default_rng(0)
+        self.a = rng.uniform(-2, 0, n)
+        self.b = rng.uniform(0, 10, n)
+        self.c = rng.uniform(-5, 5, n)
+        self.wall_x = rng.uniform(*MathGame.WALL_X_RANGE, n)
+        self.wall_height = rng.uniform(*MathGame.WALL_HEIGHT_RANGE, n)
+
+    def time_per_attempt(self, n):
+        for attempt in zip(self.a.tolist(), self.b.tolist(), self.c.tolist(),
+                           self.wall_x.tolist(), self.wall_height.tolist()):
+            MathGame.clears_wall(*attempt)
+
+    def time_center_only(self, n):
+        for a, b, c, wall_x, wall_height in zip(self.a.tolist(), self.b.tolist(), self.c.tolist(),
+                                                self.wall_x.tolist(), self.wall_height.tolist()):
+            a * wall_x**2 + b * wall_x + c > wall_height
+
+    def time_batch(self, n):
+        MathGame.grade_attempts(self.a, self.b, self.c, self.wall_x, self.wall_height)
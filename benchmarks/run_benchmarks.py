@@ -0,0 +1,182 @@
+"""Runs the benchmark suite and stores the results for regression comparison.
+
+Benchmarks are asv-style classes in benchmarks/bench_*.py: an optional
+`params` list, an optional setup(param)/teardown(param), and time_*(param)
+methods. Raising NotImplementedError from setup skips that parameter.
+
+    python benchmarks/run_benchmarks.py                  # run, save, compare with the last run
+    python benchmarks/run_benchmarks.py -k csv --max-size 10000000
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<file>.json
+
+Results are written to benchmarks/results/<timestamp>-<commit>.json.
+"""
+import argparse
+import glob
+import importlib.util
+import inspect
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+def _load_modules():
+    sys.path.insert(0, REPO_ROOT)
+    sys.path.insert(0, BENCH_DIR)
+    modules = []
+    for path in sorted(glob.glob(os.path.join(BENCH_DIR, 'bench_*.py'))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        modules.append(module)
+    return modules
+
+def _benchmarks(modules, keyword, max_size):
+    """Yields (name, class, method name, param) for every selected benchmark."""
+    for module in modules:
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            methods = [name for name in dir(cls) if name.startswith('time_')]
+            for param in getattr(cls, 'params', [None]):
+                if isinstance(param, (int, float)) and param > max_size:
+                    continue
+                for method in methods:
+                    name = f"{module.__name__}.{class_name}.{method}"
+                    if param is not None:
+                        name += f"({param})"
+                    if keyword and keyword not in name:
+                        continue
+                    yield name, cls, method, param
+
+def _time(function, repeat, min_time):
+    """Returns the best seconds per call over `repeat` rounds of enough calls to take min_time."""
+    timer = timeit.Timer(function)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        best = min(best, timer.timeit(number) / number)
+    return best
+
+def run(keyword=None, max_size=10**6, repeat=3, min_time=0.2):
+    results = {}
+    groups = {}
+    for name, cls, method, param in _benchmarks(_load_modules(), keyword, max_size):
+        groups.setdefault((cls, param), []).append((name, method))
+
+    for (cls, param), entries in groups.items():
+        instance = cls()
+        args = () if param is None else (param,)
+        try:
+            if hasattr(instance, 'setup'):
+                instance.setup(*args)
+        except NotImplementedError:
+            continue
+        try:
+            for name, method in entries:
+                bound = getattr(instance, method)
+                try:
+                    seconds = _time(lambda: bound(*args), repeat, min_time)
+                except Exception as e:
+                    print(f"{name:<70} failed: {e!r}", flush=True)
+                    continue
+                results[name] = seconds
+                print(f"{name:<70} {_format(seconds)}", flush=True)
+        finally:
+            if hasattr(instance, 'teardown'):
+                instance.teardown(*args)
+    return results
+
+def _format(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+def _commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                       text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def save(results):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    commit = _commit()
+    path = os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{commit}.json")
+    with open(path, 'w') as handle:
+        json.dump({
+            'commit': commit,
+            'python': platform.python_version(),
+            'machine': platform.platform(),
+            'results': results,
+        }, handle, indent=2, sort_keys=True)
+    return path
+
+def compare(results, baseline_path, threshold):
+    """Prints how results changed against a saved run; returns the number of regressions."""
+    with open(baseline_path) as handle:
+        baseline = json.load(handle)['results']
+    regressions = 0
+    print(f"\nCompared with {os.path.basename(baseline_path)} (threshold x{threshold}):")
+    for name in sorted(set(results) & set(baseline)):
+        ratio = results[name] / baseline[name]
+        if ratio > threshold:
+            status = 'REGRESSION'
+            regressions += 1
+        elif ratio < 1 / threshold:
+            status = 'improved'
+        else:
+            continue
+        print(f"{status:>10} x{ratio:5.2f} {name}")
+    if not regressions:
+        print("No regressions.")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite.")
+    parser.add_argument('-k', dest='keyword', help="only run benchmarks whose name contains this text")
+    parser.add_argument('--max-size', type=float, default=10**6,
+                        help="skip parameters above this size (default: 1e6; use 1e7 for the full suite)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--min-time', type=float, default=0.2, help="seconds per timing round")
+    parser.add_argument('--compare', metavar='RESULTS', help="saved results to compare with (default: the latest)")
+    parser.add_argument('--threshold', type=float, default=1.2, help="slowdown ratio reported as a regression")
+    parser.add_argument('--no-save', action='store_true')
+    args = parser.parse_args(argv)
+
+    previous = sorted(glob.glob(os.path.join(RESULTS_DIR, '*.json')))
+    baseline = args.compare or (previous[-1] if previous else None)
+
+    # Benchmarks that write files do so in a scratch directory.
+    with tempfile.TemporaryDirectory() as scratch:
+        cwd = os.getcwd()
+        os.chdir(scratch)
+        try:
+            results = run(args.keyword, args.max_size, args.repeat, args.min_time)
+        finally:
+            os.chdir(cwd)
+
+    if not args.no_save:
+        print(f"\nSaved {save(results)}")
+    if baseline:
+        return 1 if compare(results, baseline, args.threshold) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())